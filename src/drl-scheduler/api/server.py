@@ -18,10 +18,10 @@ FastAPI server for DRL scheduler management and monitoring
 
 import logging
 import asyncio
-import threading
-from typing import Optional, Dict, Any
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import time
+from typing import Optional, Dict, Any, Tuple
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import uvicorn
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
@@ -32,35 +32,49 @@ from monitoring.metrics import REGISTRY
 logger = logging.getLogger(__name__)
 
 
-# Global scheduler reference (set by start_api_server)
-_scheduler = None
+class _State:
+    """Module state shared by the handlers (set by start_api_server)"""
+    scheduler = None
+
+
+# Cached /metrics payload; the TTL stays well below the scrape interval
+METRICS_CACHE_TTL = 1.0
+_metrics_cache: Tuple[float, bytes] = (float('-inf'), b"")
+_metrics_lock = asyncio.Lock()
+
+# Cluster snapshot shared by the /cluster/* endpoints
+STATE_CACHE_TTL = 1.0
+_state_cache: Tuple[float, Optional[Dict[str, Any]]] = (float('-inf'), None)
+_state_lock = asyncio.Lock()
 
 
 app = FastAPI(
     title="DRL Kubernetes Scheduler API",
     description="API for managing and monitoring the DRL-enhanced scheduler",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 
-class SchedulerStatus(BaseModel):
-    """Scheduler status response"""
-    status: str
-    scheduled_pods: int
-    failed_schedules: int
-    training_episodes: int
-    epsilon: float
-    model_version: str
-
-
 class TrainingRequest(BaseModel):
     """Request to trigger training"""
     episodes: int = 1
     save_model: bool = True
 
 
-# Global scheduler reference (set by start_api_server)
-_scheduler = None
+async def _cached_state(max_age: float = STATE_CACHE_TTL) -> Dict[str, Any]:
+    """Return a recent cluster snapshot, refreshing it at most once per max_age"""
+    global _state_cache
+
+    fetched_at, state = _state_cache
+    if state is None or time.monotonic() - fetched_at >= max_age:
+        async with _state_lock:
+            fetched_at, state = _state_cache
+            if state is None or time.monotonic() - fetched_at >= max_age:
+                state = await _State.scheduler.state_observer.get_state()
+                _state_cache = (time.monotonic(), state)
+
+    return state
 
 
 @app.get("/")
@@ -76,7 +90,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    if _scheduler is None:
+    if _State.scheduler is None:
         raise HTTPException(status_code=503, detail="Scheduler not initialized")
 
     return {"status": "healthy"}
@@ -85,37 +99,38 @@ async def health_check():
 @app.get("/readiness")
 async def readiness_check():
     """Readiness check endpoint"""
-    if _scheduler is None or not hasattr(_scheduler, 'drl_agent'):
+    if _State.scheduler is None or not hasattr(_State.scheduler, 'drl_agent'):
         raise HTTPException(status_code=503, detail="Scheduler not ready")
 
     return {"status": "ready"}
 
 
-@app.get("/status", response_model=SchedulerStatus)
+@app.get("/status", response_model=None)
 async def get_status():
     """Get scheduler status"""
-    if _scheduler is None:
+    if _State.scheduler is None:
         raise HTTPException(status_code=503, detail="Scheduler not initialized")
 
-    return SchedulerStatus(
-        status="running",
-        scheduled_pods=_scheduler.scheduled_pods,
-        failed_schedules=_scheduler.failed_schedules,
-        training_episodes=_scheduler.training_episodes,
-        epsilon=_scheduler.drl_agent.epsilon if _scheduler.drl_agent else 0.0,
-        model_version="1.0.0"
-    )
+    # Polled by dashboards, so skip model validation and encode directly
+    return ORJSONResponse(content={
+        "status": "running",
+        "scheduled_pods": _State.scheduler.scheduled_pods,
+        "failed_schedules": _State.scheduler.failed_schedules,
+        "training_episodes": _State.scheduler.training_episodes,
+        "epsilon": _State.scheduler.drl_agent.epsilon if _State.scheduler.drl_agent else 0.0,
+        "model_version": "1.0.0"
+    })
 
 
-@app.get("/cluster/state")
+@app.get("/cluster/state", response_model=None)
 async def get_cluster_state():
     """Get current cluster state"""
-    if _scheduler is None or not _scheduler.state_observer:
+    if _State.scheduler is None or not _State.scheduler.state_observer:
         raise HTTPException(status_code=503, detail="State observer not initialized")
 
-    state = await _scheduler.state_observer.get_state()
+    state = await _cached_state()
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "cluster_cpu_usage": state.get('cluster_cpu_usage', 0),
         "cluster_memory_usage": state.get('cluster_memory_usage', 0),
         "total_nodes": state.get('total_nodes', 0),
@@ -126,45 +141,46 @@ async def get_cluster_state():
     })
 
 
-@app.get("/cluster/nodes")
+@app.get("/cluster/nodes", response_model=None)
 async def get_node_metrics():
     """Get metrics for all nodes"""
-    if _scheduler is None or not _scheduler.state_observer:
+    if _State.scheduler is None or not _State.scheduler.state_observer:
         raise HTTPException(status_code=503, detail="State observer not initialized")
 
-    state = await _scheduler.state_observer.get_state()
+    state = await _cached_state()
 
-    return JSONResponse(content=state.get('nodes', {}))
+    return ORJSONResponse(content=state['node_table'].rows())
 
 
-@app.get("/cluster/nodes/{node_name}")
+@app.get("/cluster/nodes/{node_name}", response_model=None)
 async def get_node_detail(node_name: str):
     """Get detailed metrics for a specific node"""
-    if _scheduler is None or not _scheduler.state_observer:
+    if _State.scheduler is None or not _State.scheduler.state_observer:
         raise HTTPException(status_code=503, detail="State observer not initialized")
 
-    metrics = await _scheduler.state_observer.get_node_metrics(node_name)
+    state = await _cached_state()
+    metrics = state['node_table'].rows().get(node_name)
 
     if not metrics:
         raise HTTPException(status_code=404, detail=f"Node {node_name} not found")
 
-    return JSONResponse(content=metrics)
+    return ORJSONResponse(content=metrics)
 
 
 @app.post("/training/trigger")
 async def trigger_training(request: TrainingRequest):
     """Manually trigger training"""
-    if _scheduler is None or not _scheduler.drl_agent:
+    if _State.scheduler is None or not _State.scheduler.drl_agent:
         raise HTTPException(status_code=503, detail="DRL agent not initialized")
 
     try:
         results = []
         for _ in range(request.episodes):
-            metrics = await _scheduler.drl_agent.train()
+            metrics = await _State.scheduler.drl_agent.train()
             results.append(metrics)
 
         if request.save_model:
-            await _scheduler.drl_agent.save_model()
+            await _State.scheduler.drl_agent.save_model()
 
         return {
             "status": "success",
@@ -179,11 +195,11 @@ async def trigger_training(request: TrainingRequest):
 @app.post("/model/save")
 async def save_model():
     """Save the current model"""
-    if _scheduler is None or not _scheduler.drl_agent:
+    if _State.scheduler is None or not _State.scheduler.drl_agent:
         raise HTTPException(status_code=503, detail="DRL agent not initialized")
 
     try:
-        await _scheduler.drl_agent.save_model()
+        await _State.scheduler.drl_agent.save_model()
         return {"status": "success", "message": "Model saved"}
     except Exception as e:
         logger.error(f"Failed to save model: {e}")
@@ -193,11 +209,11 @@ async def save_model():
 @app.post("/model/load")
 async def load_model():
     """Load a saved model"""
-    if _scheduler is None or not _scheduler.drl_agent:
+    if _State.scheduler is None or not _State.scheduler.drl_agent:
         raise HTTPException(status_code=503, detail="DRL agent not initialized")
 
     try:
-        await _scheduler.drl_agent.load_model()
+        await _State.scheduler.drl_agent.load_model()
         return {"status": "success", "message": "Model loaded"}
     except Exception as e:
         logger.error(f"Failed to load model: {e}")
@@ -207,52 +223,64 @@ async def load_model():
 @app.get("/config")
 async def get_config():
     """Get current scheduler configuration"""
-    if _scheduler is None:
+    if _State.scheduler is None:
         raise HTTPException(status_code=503, detail="Scheduler not initialized")
 
     return {
-        "scheduler_name": _scheduler.config.scheduler_name,
-        "enable_training": _scheduler.config.enable_training,
-        "training_interval": _scheduler.config.training_interval,
-        "learning_rate": _scheduler.config.learning_rate,
-        "gamma": _scheduler.config.gamma,
-        "epsilon": _scheduler.drl_agent.epsilon if _scheduler.drl_agent else 0.0,
-        "reward_weights": _scheduler.config.reward_weights
+        "scheduler_name": _State.scheduler.config.scheduler_name,
+        "enable_training": _State.scheduler.config.enable_training,
+        "training_interval": _State.scheduler.config.training_interval,
+        "learning_rate": _State.scheduler.config.learning_rate,
+        "gamma": _State.scheduler.config.gamma,
+        "epsilon": _State.scheduler.drl_agent.epsilon if _State.scheduler.drl_agent else 0.0,
+        "reward_weights": _State.scheduler.config.reward_weights._asdict()
     }
 
 
-@app.get("/metrics")
+@app.get("/metrics", response_class=Response)
 async def metrics():
     """Prometheus metrics endpoint"""
-    return generate_latest(REGISTRY)
+    global _metrics_cache
+
+    # Concurrent scrapes within the TTL share a single generation
+    generated_at, payload = _metrics_cache
+    if time.monotonic() - generated_at >= METRICS_CACHE_TTL:
+        async with _metrics_lock:
+            generated_at, payload = _metrics_cache
+            if time.monotonic() - generated_at >= METRICS_CACHE_TTL:
+                payload = generate_latest(REGISTRY)
+                _metrics_cache = (time.monotonic(), payload)
+
+    # Scrapes are cluster-local, so compression costs more CPU than it saves
+    return Response(
+        content=payload,
+        media_type=CONTENT_TYPE_LATEST,
+        headers={"Content-Encoding": "identity"}
+    )
 
 
 async def start_api_server(scheduler, config: SchedulerConfig):
-    """Start the FastAPI server in a background thread"""
-    global _scheduler
-    _scheduler = scheduler
+    """Serve the FastAPI app on the caller's event loop"""
+    _State.scheduler = scheduler
 
     logger.info(f"Starting API server on port {config.api_port}")
-    logger.info(f"Scheduler reference set: {_scheduler is not None}")
-
-    # Run uvicorn in a separate thread to avoid async issues
-    def run_server():
-        uvicorn.run(
-            app,
-            host="0.0.0.0",
-            port=config.api_port,
-            log_level="info",
-            access_log=False
-        )
-
-    server_thread = threading.Thread(target=run_server, daemon=True)
-    server_thread.start()
-    logger.info("===== UVICORN SERVER STARTED IN BACKGROUND THREAD =====")
-
-    # Keep the task alive
+    logger.info(f"Scheduler reference set: {_State.scheduler is not None}")
+
+    server_config = uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=config.api_port,
+        log_level="info",
+        access_log=False,
+        http="httptools"
+    )
+    server = uvicorn.Server(server_config)
+
+    # Shutdown signals are handled by main.py for the whole process
+    server.install_signal_handlers = lambda: None
+
     try:
-        while True:
-            await asyncio.sleep(60)
+        await server.serve()
     except asyncio.CancelledError:
         logger.info("API server task cancelled")
-        raise
\ No newline at end of file
+        raise
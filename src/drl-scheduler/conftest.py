@@ -0,0 +1 @@
+"""Pytest configuration; keeps the scheduler package importable from tests"""
@@ -3,36 +3,42 @@
 Example script demonstrating DRL Scheduler usage
 """
 
-import requests
+import asyncio
 import json
 import time
 from typing import Dict, Any
 
+import httpx
+import requests
+
 # Configuration
 SCHEDULER_API = "http://localhost:8000"
 
+# Shared session so repeated calls reuse the same keep-alive connection
+SESSION = requests.Session()
+
 
 def get_scheduler_status() -> Dict[str, Any]:
     """Get current scheduler status"""
-    response = requests.get(f"{SCHEDULER_API}/status")
+    response = SESSION.get(f"{SCHEDULER_API}/status")
     return response.json()
 
 
 def get_cluster_state() -> Dict[str, Any]:
     """Get current cluster state"""
-    response = requests.get(f"{SCHEDULER_API}/cluster/state")
+    response = SESSION.get(f"{SCHEDULER_API}/cluster/state")
     return response.json()
 
 
 def get_node_metrics() -> Dict[str, Any]:
     """Get metrics for all nodes"""
-    response = requests.get(f"{SCHEDULER_API}/cluster/nodes")
+    response = SESSION.get(f"{SCHEDULER_API}/cluster/nodes")
     return response.json()
 
 
 def trigger_training(episodes: int = 1, save_model: bool = True) -> Dict[str, Any]:
     """Manually trigger training"""
-    response = requests.post(
+    response = SESSION.post(
         f"{SCHEDULER_API}/training/trigger",
         json={"episodes": episodes, "save_model": save_model}
     )
@@ -41,37 +47,43 @@ def trigger_training(episodes: int = 1, save_model: bool = True) -> Dict[str, An
 
 def save_model() -> Dict[str, Any]:
     """Save the current model"""
-    response = requests.post(f"{SCHEDULER_API}/model/save")
+    response = SESSION.post(f"{SCHEDULER_API}/model/save")
     return response.json()
 
 
 def get_config() -> Dict[str, Any]:
     """Get current configuration"""
-    response = requests.get(f"{SCHEDULER_API}/config")
+    response = SESSION.get(f"{SCHEDULER_API}/config")
     return response.json()
 
 
-def monitor_scheduling(duration: int = 60):
+async def monitor_scheduling(duration: int = 60):
     """Monitor scheduling decisions for a duration"""
     print(f"Monitoring scheduler for {duration} seconds...\n")
 
-    start_time = time.time()
-    initial_status = get_scheduler_status()
-
-    while time.time() - start_time < duration:
-        time.sleep(5)
-
-        status = get_scheduler_status()
-        cluster = get_cluster_state()
-
-        print(f"\r[{time.time() - start_time:.0f}s] "
-              f"Scheduled: {status['scheduled_pods']}, "
-              f"Failed: {status['failed_schedules']}, "
-              f"Episodes: {status['training_episodes']}, "
-              f"Epsilon: {status['epsilon']:.3f}, "
-              f"CPU: {cluster['cluster_cpu_usage']:.2%}, "
-              f"Memory: {cluster['cluster_memory_usage']:.2%}",
-              end='')
+    async with httpx.AsyncClient(base_url=SCHEDULER_API) as client:
+        start_time = time.time()
+        status = (await client.get("/status")).json()
+
+        while time.time() - start_time < duration:
+            await asyncio.sleep(5)
+
+            # Both endpoints are independent, so fetch them concurrently
+            status_resp, cluster_resp = await asyncio.gather(
+                client.get("/status"),
+                client.get("/cluster/state")
+            )
+            status = status_resp.json()
+            cluster = cluster_resp.json()
+
+            print(f"\r[{time.time() - start_time:.0f}s] "
+                  f"Scheduled: {status['scheduled_pods']}, "
+                  f"Failed: {status['failed_schedules']}, "
+                  f"Episodes: {status['training_episodes']}, "
+                  f"Epsilon: {status['epsilon']:.3f}, "
+                  f"CPU: {cluster['cluster_cpu_usage']:.2%}, "
+                  f"Memory: {cluster['cluster_memory_usage']:.2%}",
+                  end='')
 
     print("\n\nFinal Status:")
     print(json.dumps(status, indent=2))
@@ -125,7 +137,7 @@ def main():
         print("\n5. Monitoring scheduling decisions...")
         print("Press Ctrl+C to skip...")
         try:
-            monitor_scheduling(duration=30)
+            asyncio.run(monitor_scheduling(duration=30))
         except KeyboardInterrupt:
             print("\nSkipped monitoring")
 
@@ -147,7 +159,7 @@ def main():
         print("Example completed successfully!")
         print("=" * 80)
 
-    except requests.exceptions.ConnectionError:
+    except (requests.exceptions.ConnectionError, httpx.ConnectError):
         print(f"\nError: Cannot connect to scheduler API at {SCHEDULER_API}")
         print("Make sure the scheduler is running and accessible.")
         print("\nTo port-forward:")
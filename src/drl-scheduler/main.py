@@ -18,24 +18,41 @@ Main entry point for DRL-Enhanced Kubernetes Scheduler
 """
 
 import asyncio
+import atexit
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
 from typing import Optional
 
+import uvloop
+
 from scheduler.k8s_scheduler import DRLScheduler
-from scheduler.config import SchedulerConfig
+from scheduler.config import get_config
 from api.server import start_api_server
 from monitoring.metrics import setup_metrics
 
-# Configure logging
+# Configure logging. Records are queued on the event loop thread and written
+# by a listener thread, so log I/O never blocks the scheduler or API handlers.
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('/app/logs/scheduler.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_log_handlers, respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('/app/logs/scheduler.log')
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 
 logger = logging.getLogger(__name__)
@@ -46,7 +63,7 @@ class SchedulerManager:
 
     def __init__(self):
         self.scheduler: Optional[DRLScheduler] = None
-        self.config = SchedulerConfig()
+        self.config = get_config()
         self.running = False
 
     async def start(self):
@@ -63,20 +80,16 @@ class SchedulerManager:
             await self.scheduler.initialize()
             logger.info("DRL Scheduler initialized")
 
-            # Start API server in background
-            api_task = asyncio.create_task(
-                start_api_server(self.scheduler, self.config)
-            )
             logger.info(f"API server starting on port {self.config.api_port}")
 
-            # Start the scheduling loop
             self.running = True
-            schedule_task = asyncio.create_task(self.scheduler.run())
-
             logger.info("DRL Scheduler is now running")
 
-            # Wait for both tasks
-            await asyncio.gather(api_task, schedule_task)
+            # Serve the API and run the scheduling loop on the same event loop
+            await asyncio.gather(
+                start_api_server(self.scheduler, self.config),
+                self.scheduler.run()
+            )
 
         except Exception as e:
             logger.error(f"Error starting scheduler: {e}", exc_info=True)
@@ -119,4 +132,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    # The API server shares this loop, so uvloop covers it as well
+    uvloop.install()
     asyncio.run(main())
@@ -32,28 +32,34 @@ SCHEDULE_ATTEMPTS = Counter(
     'drl_scheduler_schedule_attempts_total',
     'Total number of scheduling attempts',
     ['status'],  # success, failed
-    registry=REGISTRY
+    registry=None  # exported through _BatchedCounterCollector
 )
+SCHEDULE_ATTEMPTS_SUCCESS = SCHEDULE_ATTEMPTS.labels(status='success')
+SCHEDULE_ATTEMPTS_FAILED = SCHEDULE_ATTEMPTS.labels(status='failed')
 
+# Histograms are registered on first observation (see _observe) so that a
+# scheduler which has not placed any pods yet exports no empty buckets
 SCHEDULE_DURATION = Histogram(
     'drl_scheduler_schedule_duration_seconds',
     'Time spent scheduling a pod',
-    buckets=[0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0],
-    registry=REGISTRY
+    buckets=tuple(0.001 * (2 ** i) for i in range(13)),  # 1ms .. ~4s
+    registry=None
 )
 
 SCHEDULE_REWARD = Histogram(
     'drl_scheduler_schedule_reward',
     'Reward value for scheduling decisions',
-    buckets=[-1.0, -0.5, 0.0, 0.5, 0.75, 0.9, 1.0],
-    registry=REGISTRY
+    buckets=(-1.0, -0.5, 0.0, 0.25, 0.5, 0.75, 0.9, 1.0),
+    registry=None
 )
 
+_registered_histograms = set()
+
 # DRL Agent metrics
 TRAINING_EPISODES = Counter(
     'drl_scheduler_training_episodes_total',
     'Total number of training episodes',
-    registry=REGISTRY
+    registry=None  # exported through _BatchedCounterCollector
 )
 
 TRAINING_LOSS = Gauge(
@@ -93,6 +99,8 @@ NODE_COUNT = Gauge(
     ['state'],  # ready, not_ready
     registry=REGISTRY
 )
+NODE_COUNT_READY = NODE_COUNT.labels(state='ready')
+NODE_COUNT_NOT_READY = NODE_COUNT.labels(state='not_ready')
 
 POD_COUNT = Gauge(
     'drl_scheduler_pod_count',
@@ -101,6 +109,52 @@ POD_COUNT = Gauge(
 )
 
 
+class _BatchedCounterCollector:
+    """
+    Accumulates per-event counter increments as plain ints and folds them
+    into the Prometheus counters only when the registry is collected
+    """
+
+    def __init__(self):
+        self.schedule_success = 0
+        self.schedule_failed = 0
+        self.training_episodes = 0
+
+    def flush(self):
+        """Apply pending increments to the underlying counters"""
+        if self.schedule_success:
+            SCHEDULE_ATTEMPTS_SUCCESS.inc(self.schedule_success)
+            self.schedule_success = 0
+
+        if self.schedule_failed:
+            SCHEDULE_ATTEMPTS_FAILED.inc(self.schedule_failed)
+            self.schedule_failed = 0
+
+        if self.training_episodes:
+            TRAINING_EPISODES.inc(self.training_episodes)
+            self.training_episodes = 0
+
+    def describe(self):
+        return SCHEDULE_ATTEMPTS.describe() + TRAINING_EPISODES.describe()
+
+    def collect(self):
+        self.flush()
+        yield from SCHEDULE_ATTEMPTS.collect()
+        yield from TRAINING_EPISODES.collect()
+
+
+_BATCHED_COUNTERS = _BatchedCounterCollector()
+REGISTRY.register(_BATCHED_COUNTERS)
+
+
+def _observe(histogram: Histogram, value: float):
+    """Observe a value, registering the histogram on first use"""
+    if histogram not in _registered_histograms:
+        REGISTRY.register(histogram)
+        _registered_histograms.add(histogram)
+    histogram.observe(value)
+
+
 class SchedulerMetrics:
     """Wrapper for scheduler metrics"""
 
@@ -115,23 +169,24 @@ class SchedulerMetrics:
         reward: float
     ):
         """Record a successful scheduling decision"""
-        SCHEDULE_ATTEMPTS.labels(status='success').inc()
-        SCHEDULE_DURATION.observe(duration)
-        SCHEDULE_REWARD.observe(reward)
-
-        logger.info(
-            f"Metrics: Scheduled {pod_name} to {node_name} "
-            f"(duration={duration:.3f}s, reward={reward:.3f})"
+        _BATCHED_COUNTERS.schedule_success += 1
+        _observe(SCHEDULE_DURATION, duration)
+        _observe(SCHEDULE_REWARD, reward)
+
+        # The scheduler already logs each placement at INFO
+        logger.debug(
+            "Metrics: Scheduled %s to %s (duration=%.3fs, reward=%.3f)",
+            pod_name, node_name, duration, reward
         )
 
     def record_failed_schedule(self, pod_name: str, reason: str):
         """Record a failed scheduling attempt"""
-        SCHEDULE_ATTEMPTS.labels(status='failed').inc()
-        logger.warning(f"Metrics: Failed to schedule {pod_name}: {reason}")
+        _BATCHED_COUNTERS.schedule_failed += 1
+        logger.warning("Metrics: Failed to schedule %s: %s", pod_name, reason)
 
     def record_training_metrics(self, metrics: Dict[str, Any]):
         """Record training metrics"""
-        TRAINING_EPISODES.inc()
+        _BATCHED_COUNTERS.training_episodes += 1
 
         if 'loss' in metrics:
             TRAINING_LOSS.set(metrics['loss'])
@@ -139,20 +194,19 @@ class SchedulerMetrics:
         if 'epsilon' in metrics:
             EXPLORATION_RATE.set(metrics['epsilon'])
 
-        logger.info(f"Metrics: Training completed with metrics: {metrics}")
+        logger.info("Metrics: Training completed with metrics: %s", metrics)
 
     def update_cluster_metrics(self, state: Dict[str, Any]):
         """Update cluster-level metrics"""
-        CLUSTER_CPU_USAGE.set(state.get('cluster_cpu_usage', 0))
-        CLUSTER_MEMORY_USAGE.set(state.get('cluster_memory_usage', 0))
-
-        total_nodes = state.get('total_nodes', 0)
-        ready_nodes = state.get('ready_nodes', 0)
-
-        NODE_COUNT.labels(state='ready').set(ready_nodes)
-        NODE_COUNT.labels(state='not_ready').set(total_nodes - ready_nodes)
-
-        POD_COUNT.set(state.get('total_pods', 0))
+        get = state.get
+        total_nodes = get('total_nodes', 0)
+        ready_nodes = get('ready_nodes', 0)
+
+        CLUSTER_CPU_USAGE.set(get('cluster_cpu_usage', 0))
+        CLUSTER_MEMORY_USAGE.set(get('cluster_memory_usage', 0))
+        NODE_COUNT_READY.set(ready_nodes)
+        NODE_COUNT_NOT_READY.set(total_nodes - ready_nodes)
+        POD_COUNT.set(get('total_pods', 0))
 
     def update_buffer_size(self, size: int):
         """Update experience buffer size"""
@@ -2,7 +2,7 @@
 Init file for scheduler package
 """
 
-from .config import SchedulerConfig
+from .config import SchedulerConfig, RewardWeights, get_config
 from .k8s_scheduler import DRLScheduler
 from .drl_agent import DRLAgent
 from .state_observer import ClusterStateObserver
@@ -10,18 +10,24 @@ from .reward_calculator import RewardCalculator
 from .models import (
     SchedulerPolicyNetwork,
     SchedulerValueNetwork,
+    SchedulerActorCritic,
     AttentionSchedulerNetwork,
-    GraphNeuralScheduler
+    GraphNeuralScheduler,
+    CUDAGraphModule
 )
 
 __all__ = [
     'SchedulerConfig',
+    'RewardWeights',
+    'get_config',
     'DRLScheduler',
     'DRLAgent',
     'ClusterStateObserver',
     'RewardCalculator',
     'SchedulerPolicyNetwork',
     'SchedulerValueNetwork',
+    'SchedulerActorCritic',
     'AttentionSchedulerNetwork',
-    'GraphNeuralScheduler'
+    'GraphNeuralScheduler',
+    'CUDAGraphModule'
 ]
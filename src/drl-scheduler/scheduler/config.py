@@ -17,11 +17,30 @@ Configuration for DRL Scheduler
 """
 
 import os
-from dataclasses import dataclass, field
-from typing import List, Dict
+import functools
+from dataclasses import dataclass
+from typing import List, Dict, NamedTuple
 
 
-@dataclass
+class RewardWeights(NamedTuple):
+    """Weights of the reward objectives"""
+    resource_utilization: float
+    load_balance: float
+    latency: float
+    affinity: float
+    energy: float
+
+
+DEFAULT_REWARD_WEIGHTS = RewardWeights(
+    resource_utilization=float(os.getenv("REWARD_RESOURCE_UTIL", "0.3")),
+    load_balance=float(os.getenv("REWARD_LOAD_BALANCE", "0.25")),
+    latency=float(os.getenv("REWARD_LATENCY", "0.25")),
+    affinity=float(os.getenv("REWARD_AFFINITY", "0.1")),
+    energy=float(os.getenv("REWARD_ENERGY", "0.1"))
+)
+
+
+@dataclass(slots=True, frozen=True)
 class SchedulerConfig:
     """Configuration for the DRL-enhanced scheduler"""
 
@@ -29,11 +48,15 @@ class SchedulerConfig:
     scheduler_name: str = "drl-scheduler"
     namespace: str = os.getenv("NAMESPACE", "default")
     polling_interval: float = float(os.getenv("POLLING_INTERVAL", "2.0"))
+    schedule_batch_max: int = int(os.getenv("SCHEDULE_BATCH_MAX", "8"))
+    schedule_batch_window_ms: float = float(os.getenv("SCHEDULE_BATCH_WINDOW_MS", "5"))
 
     # DRL Model settings
     model_path: str = os.getenv("MODEL_PATH", "/app/models")
     model_name: str = os.getenv("MODEL_NAME", "ppo_scheduler")
     use_pretrained: bool = os.getenv("USE_PRETRAINED", "false").lower() == "true"
+    enable_compile: bool = os.getenv("ENABLE_COMPILE", "true").lower() == "true"
+    cpu_inference_dtype: str = os.getenv("CPU_INFERENCE_DTYPE", "int8").lower()
 
     # Training settings
     enable_training: bool = os.getenv("ENABLE_TRAINING", "true").lower() == "true"
@@ -41,6 +64,7 @@ class SchedulerConfig:
     batch_size: int = int(os.getenv("BATCH_SIZE", "64"))
     learning_rate: float = float(os.getenv("LEARNING_RATE", "0.0003"))
     gamma: float = float(os.getenv("GAMMA", "0.99"))
+    ppo_epochs: int = int(os.getenv("PPO_EPOCHS", "4"))
 
     # State space settings
     max_nodes: int = int(os.getenv("MAX_NODES", "100"))
@@ -48,13 +72,7 @@ class SchedulerConfig:
     feature_dim: int = int(os.getenv("FEATURE_DIM", "128"))
 
     # Reward function weights
-    reward_weights: Dict[str, float] = field(default_factory=lambda: {
-        "resource_utilization": float(os.getenv("REWARD_RESOURCE_UTIL", "0.3")),
-        "load_balance": float(os.getenv("REWARD_LOAD_BALANCE", "0.25")),
-        "latency": float(os.getenv("REWARD_LATENCY", "0.25")),
-        "affinity": float(os.getenv("REWARD_AFFINITY", "0.1")),
-        "energy": float(os.getenv("REWARD_ENERGY", "0.1"))
-    })
+    reward_weights: RewardWeights = DEFAULT_REWARD_WEIGHTS
 
     # API settings
     api_port: int = int(os.getenv("API_PORT", "8000"))
@@ -90,6 +108,21 @@ class SchedulerConfig:
 
     def __post_init__(self):
         """Validate configuration"""
-        assert sum(self.reward_weights.values()) <= 1.1, "Reward weights should sum to ~1.0"
-        assert 0 < self.gamma <= 1.0, "Gamma must be between 0 and 1"
-        assert self.learning_rate > 0, "Learning rate must be positive"
+        if not 0 < self.gamma <= 1.0:
+            raise ValueError("Gamma must be between 0 and 1")
+        if self.learning_rate <= 0:
+            raise ValueError("Learning rate must be positive")
+        if self.schedule_batch_max < 1:
+            raise ValueError("Schedule batch size must be at least 1")
+        if self.cpu_inference_dtype not in ("int8", "bfloat16", "float32"):
+            raise ValueError("CPU inference dtype must be int8, bfloat16 or float32")
+        if self.ppo_epochs < 1:
+            raise ValueError("PPO epochs must be at least 1")
+        if sum(self.reward_weights) > 1.1:
+            raise ValueError("Reward weights should sum to ~1.0")
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> SchedulerConfig:
+    """Return the process-wide configuration, parsed from the environment once"""
+    return SchedulerConfig()
@@ -16,34 +16,99 @@
 Deep Reinforcement Learning Agent for Scheduling Decisions
 """
 
+import contextlib
+import copy
 import os
 import logging
 import random
-from typing import List, Dict, Any, Optional
-from collections import deque
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import numba
 import numpy as np
 from stable_baselines3 import PPO
 from stable_baselines3.common.vec_env import DummyVecEnv
 
 from .config import SchedulerConfig
-from .models import SchedulerPolicyNetwork, SchedulerValueNetwork
+from .models import CUDAGraphModule, SchedulerActorCritic
 from .state_observer import ClusterStateObserver
+from .utils import BoundedCache, pod_requests
 
 logger = logging.getLogger(__name__)
 
-
-class Experience:
-    """Container for experience tuples"""
-    def __init__(self, state, action, reward, next_state, done):
-        self.state = state
-        self.action = action
-        self.reward = reward
-        self.next_state = next_state
-        self.done = done
+# Exploit decisions are reused for at most this long, or until the pod
+# count moves by more than DECISION_CACHE_POD_DELTA
+DECISION_CACHE_SIZE = 256
+DECISION_CACHE_TTL = 5.0
+DECISION_CACHE_POD_DELTA = 10
+
+
+@numba.njit(cache=True, fastmath=True)
+def _encode_nodes_nb(node_features, node_idx, inv_max_pods, out):
+    """Gather eligible node rows into the zero-padded node block of a state"""
+    n = min(node_idx.shape[0], out.shape[0])
+    for i in range(n):
+        j = node_idx[i]
+        if j < 0:
+            out[i, :] = 0.0
+            continue
+        for k in range(out.shape[1]):
+            out[i, k] = node_features[j, k]
+        out[i, 2] *= inv_max_pods
+
+    # Padding past the eligible nodes in one slice assignment
+    out[n:, :] = 0.0
+
+
+class ReplayBuffer:
+    """Fixed-capacity experience ring buffer stored as preallocated column arrays"""
+
+    def __init__(self, capacity: int, state_dim: int):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.pos = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(
+        self,
+        state: np.ndarray,
+        action: int,
+        reward: float,
+        next_state: np.ndarray,
+        done: bool
+    ):
+        """Copy one experience into the next slot, overwriting the oldest"""
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size: int) -> Tuple[np.ndarray, ...]:
+        """Sample a batch as (states, actions, rewards, next_states, dones)"""
+        idx = np.random.randint(0, self.size, batch_size)
+        return (
+            self.states[idx],
+            self.actions[idx],
+            self.rewards[idx],
+            self.next_states[idx],
+            self.dones[idx]
+        )
 
 
 class DRLAgent:
@@ -53,20 +118,34 @@ class DRLAgent:
         self.config = config
         self.state_observer = state_observer
 
-        # Experience replay buffer
-        self.memory = deque(maxlen=10000)
+        # Experience replay buffer (sized once the state dimension is known)
+        self.memory = None
 
         # Exploration parameters
         self.epsilon = config.epsilon_start
 
         # Models
-        self.policy_net = None
-        self.value_net = None
+        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        self.state_dim = None
+        self.model = None
         self.optimizer = None
 
+        # Reduced-precision copy of the model for select_nodes, refreshed
+        # after every training step; self.model stays the FP32 master
+        self.model_infer = None
+        self._infer_dtype = torch.float32
+
         # PPO components
         self.ppo_model = None
 
+        # Recent exploit decisions, see _decision_key
+        self._decision_cache: OrderedDict = OrderedDict()
+        self._decision_cache_since = float('-inf')
+        self._decision_cache_pods = 0
+
+        # Parsed pod resource requests keyed by pod UID
+        self._pod_requests: Dict[str, Tuple[float, float]] = BoundedCache()
+
         # Training stats
         self.total_steps = 0
         self.episode_rewards = []
@@ -76,16 +155,38 @@ class DRLAgent:
         logger.info("Initializing DRL Agent...")
 
         # Get state dimensions
-        state_dim = await self._get_state_dimension()
+        self.state_dim = state_dim = self._get_state_dimension()
         action_dim = self.config.max_nodes
 
-        # Initialize networks
-        self.policy_net = SchedulerPolicyNetwork(
-            state_dim, action_dim, self.config.feature_dim
-        )
-        self.value_net = SchedulerValueNetwork(
-            state_dim, self.config.feature_dim
+        # Preallocated state buffer reused by _encode_state; node rows, pod
+        # features and cluster features are views into one contiguous array
+        node_end = 10 * self.config.max_nodes
+        self._state_buf = np.zeros(state_dim, dtype=np.float32)
+        self._node_buf = self._state_buf[:node_end].reshape(self.config.max_nodes, 10)
+        self._pod_buf = self._state_buf[node_end:node_end + 8]
+        self._cluster_buf = self._state_buf[node_end + 8:]
+
+        # One row per pod for batched policy inference, see select_nodes.
+        # On CUDA the rows live in pinned memory so the host-to-device copy
+        # can run asynchronously on a dedicated inference stream
+        use_cuda = self.device.type == 'cuda'
+        self._batch_tensor = torch.zeros(
+            (self.config.schedule_batch_max, state_dim),
+            dtype=torch.float32, pin_memory=use_cuda
         )
+        self._batch_buf = self._batch_tensor.numpy()
+        self._infer_stream = torch.cuda.Stream() if use_cuda else None
+
+        self.memory = ReplayBuffer(10000, state_dim)
+
+        # Initialize the shared policy/value network
+        self.model = SchedulerActorCritic(
+            state_dim, action_dim, self.config.feature_dim
+        ).to(self.device)
+
+        # Initialize optimizer; it must exist before a checkpoint restores
+        # its state
+        self.optimizer = optim.Adam(self.model.parameters(), lr=self.config.learning_rate)
 
         # Load pretrained model if available
         if self.config.use_pretrained:
@@ -93,16 +194,72 @@ class DRLAgent:
         else:
             logger.info("Starting with randomly initialized model")
 
-        # Initialize optimizer
-        params = list(self.policy_net.parameters()) + list(self.value_net.parameters())
-        self.optimizer = optim.Adam(params, lr=self.config.learning_rate)
+        if self.config.enable_compile:
+            self._compile_networks()
+
+        self._refresh_inference_model()
 
         logger.info(
             f"DRL Agent initialized with state_dim={state_dim}, "
             f"action_dim={action_dim}, feature_dim={self.config.feature_dim}"
         )
 
-    async def _get_state_dimension(self) -> int:
+    def _compile_networks(self):
+        """Compile the network and enable TF32 matmuls where available"""
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.set_float32_matmul_precision('high')
+
+        # CUDA graphs only pay off on GPU; plain Inductor fusion on CPU
+        mode = 'reduce-overhead' if torch.cuda.is_available() else 'default'
+        self.model = torch.compile(self.model, mode=mode)
+        logger.info(f"Compiled policy/value network (mode={mode})")
+
+    def _refresh_inference_model(self):
+        """Sync the inference copy with the trainable model"""
+        model = self._unwrap(self.model)
+        use_cuda = self.device.type == 'cuda'
+
+        if not use_cuda and self.config.cpu_inference_dtype == 'int8':
+            # int8 dynamic quantization repacks the weights, so rebuild
+            self.model_infer = torch.ao.quantization.quantize_dynamic(
+                model, {nn.Linear}, dtype=torch.qint8
+            ).eval()
+            return
+
+        # bf16 weights on Tensor Cores or bf16-capable CPUs; the copy is
+        # built once and then updated in place, so captured CUDA graphs stay
+        # valid. The reduce-overhead compile mode captures graphs itself
+        if self.model_infer is None:
+            dtype = torch.bfloat16
+            if not use_cuda and self.config.cpu_inference_dtype == 'float32':
+                dtype = torch.float32
+
+            infer = copy.deepcopy(model).to(dtype).eval()
+            if self.config.enable_compile:
+                infer = torch.compile(infer, mode='reduce-overhead' if use_cuda else 'default')
+            elif use_cuda:
+                infer = CUDAGraphModule(infer)
+            self.model_infer = infer
+            self._infer_dtype = dtype
+        else:
+            self._unwrap(self.model_infer).load_state_dict(model.state_dict())
+
+    def _to_device(self, array: np.ndarray) -> torch.Tensor:
+        """Wrap a sampled batch column and move it to the training device"""
+        tensor = torch.from_numpy(array)
+        if self.device.type == 'cuda':
+            tensor = tensor.pin_memory().to(self.device, non_blocking=True)
+        return tensor
+
+    @staticmethod
+    def _unwrap(module: nn.Module) -> nn.Module:
+        """Return the original module behind a torch.compile or CUDA graph wrapper"""
+        if isinstance(module, CUDAGraphModule):
+            module = module.module
+        return getattr(module, '_orig_mod', module)
+
+    def _get_state_dimension(self) -> int:
         """Calculate the dimension of state representation"""
         # Node features: CPU, memory, pods, network, etc.
         node_features = 10
@@ -117,78 +274,139 @@ class DRLAgent:
         return (node_features * self.config.max_nodes +
                 pod_features + cluster_features)
 
-    async def select_node(
+    def select_node(
         self,
         pod: Any,
         eligible_nodes: List[str],
         state: Dict[str, Any]
     ) -> Optional[str]:
         """Select the best node for a pod using the DRL policy"""
+        return self.select_nodes([pod], [eligible_nodes], state)[0]
 
-        if not eligible_nodes:
-            return None
-
-        # Encode state
-        state_vector = await self._encode_state(pod, eligible_nodes, state)
+    def select_nodes(
+        self,
+        pods: List[Any],
+        eligible_nodes: List[List[str]],
+        state: Dict[str, Any]
+    ) -> List[Optional[str]]:
+        """
+        Select nodes for a batch of pods against one cluster state snapshot
+
+        Pods that exploit and miss the decision cache share a single policy
+        forward pass, one state row per pod.
+        """
+        selected: List[Optional[str]] = [None] * len(pods)
+        pending = []  # (batch index, decision key) awaiting the policy
+
+        self._expire_decisions(state)
+
+        for i, (pod, nodes) in enumerate(zip(pods, eligible_nodes)):
+            if not nodes:
+                continue
+
+            # Epsilon-greedy exploration
+            if random.random() < self.epsilon:
+                # Explore: random selection among nodes the policy can
+                # represent, so the stored action index stays within the
+                # action space
+                selected[i] = random.choice(nodes[:self.config.max_nodes])
+                logger.debug(f"Exploration: randomly selected {selected[i]}")
+            else:
+                # Exploit: reuse a recent decision for an equivalent pod,
+                # otherwise queue the pod for the policy network
+                key = self._decision_key(pod, nodes, state)
+                cached = self._decision_cache.get(key) if key else None
+
+                if cached is not None:
+                    self._decision_cache.move_to_end(key)
+                    selected[i] = cached
+                    logger.debug(f"Exploitation: reused cached decision {cached}")
+                else:
+                    self._batch_buf[len(pending)] = self._encode_state(
+                        pod, nodes, state
+                    )
+                    pending.append((i, key))
+
+            # Decay epsilon
+            self.epsilon = max(
+                self.config.epsilon_end,
+                self.epsilon * self.config.epsilon_decay
+            )
 
-        # Epsilon-greedy exploration
-        if random.random() < self.epsilon:
-            # Explore: random selection
-            selected_node = random.choice(eligible_nodes)
-            logger.debug(f"Exploration: randomly selected {selected_node}")
-        else:
-            # Exploit: use policy network
-            selected_node = await self._select_best_node(
-                state_vector, eligible_nodes, state
+        if pending:
+            choices = self._select_best_nodes(
+                [eligible_nodes[i] for i, _ in pending]
             )
-            logger.debug(f"Exploitation: policy selected {selected_node}")
+            for (i, key), node in zip(pending, choices):
+                selected[i] = node
+                if key:
+                    self._decision_cache[key] = node
+                    if len(self._decision_cache) > DECISION_CACHE_SIZE:
+                        self._decision_cache.popitem(last=False)
+                logger.debug(f"Exploitation: policy selected {node}")
+
+        return selected
 
-        # Decay epsilon
-        self.epsilon = max(
-            self.config.epsilon_end,
-            self.epsilon * self.config.epsilon_decay
+    def _decision_key(
+        self,
+        pod: Any,
+        eligible_nodes: List[str],
+        state: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """Key under which equivalent decisions are cached, or None"""
+        # Only pods stamped from the same template are interchangeable
+        template_hash = (pod.metadata.labels or {}).get('pod-template-hash')
+        if template_hash is None:
+            return None
+
+        return (
+            template_hash,
+            tuple(eligible_nodes),
+            round(state.get('cluster_cpu_usage', 0), 2),
+            round(state.get('cluster_memory_usage', 0), 2)
         )
 
-        return selected_node
+    def _expire_decisions(self, state: Dict[str, Any]):
+        """Drop cached decisions once they are too old or the cluster has changed"""
+        now = time.monotonic()
+        total_pods = state.get('total_pods', 0)
 
-    async def _encode_state(
+        if (now - self._decision_cache_since >= DECISION_CACHE_TTL or
+                abs(total_pods - self._decision_cache_pods) > DECISION_CACHE_POD_DELTA):
+            self._decision_cache.clear()
+            self._decision_cache_since = now
+            self._decision_cache_pods = total_pods
+
+    def _encode_state(
         self,
         pod: Any,
         eligible_nodes: List[str],
         state: Dict[str, Any]
     ) -> np.ndarray:
-        """Encode the current state as a feature vector"""
-
-        features = []
-
-        # Node features for each eligible node
-        for node_name in eligible_nodes:
-            node_metrics = state['nodes'].get(node_name, {})
-
-            node_feats = [
-                node_metrics.get('cpu_usage', 0),
-                node_metrics.get('memory_usage', 0),
-                node_metrics.get('pod_count', 0) / self.config.max_pods,
-                node_metrics.get('network_rx', 0),
-                node_metrics.get('network_tx', 0),
-                node_metrics.get('disk_usage', 0),
-                node_metrics.get('cpu_allocatable', 0),
-                node_metrics.get('memory_allocatable', 0),
-                1.0 if node_metrics.get('is_ready') else 0.0,
-                len(node_metrics.get('taints', [])) / 10.0
-            ]
-            features.extend(node_feats)
-
-        # Pad if fewer nodes than max
-        while len(features) < 10 * self.config.max_nodes:
-            features.extend([0.0] * 10)
+        """
+        Encode the current state as a feature vector
+
+        The returned array is the agent's reusable state buffer and is
+        overwritten by the next call.
+        """
+        max_nodes = self.config.max_nodes
+        max_pods = self.config.max_pods
+
+        # Node features for each eligible node, gathered from the
+        # observer's per-node feature rows; unknown nodes and rows past the
+        # eligible nodes stay zero as padding
+        table = state['node_table']
+        node_idx = np.fromiter(
+            (table.idx.get(name, -1) for name in eligible_nodes[:max_nodes]),
+            np.int64
+        )
+        _encode_nodes_nb(table.features, node_idx, 1.0 / max_pods, self._node_buf)
 
         # Pod features
-        pod_cpu = self._get_pod_cpu_request(pod)
-        pod_memory = self._get_pod_memory_request(pod)
+        pod_cpu, pod_memory = self._get_pod_requests(pod)
         pod_priority = getattr(pod.spec, 'priority', 0) / 1000000.0
 
-        pod_feats = [
+        self._pod_buf[:] = (
             pod_cpu,
             pod_memory,
             pod_priority,
@@ -197,48 +415,32 @@ class DRLAgent:
             1.0 if pod.spec.node_selector else 0.0,
             len(pod.spec.containers),
             1.0 if self._is_stateful(pod) else 0.0
-        ]
-        features.extend(pod_feats)
+        )
 
         # Cluster-level features
-        cluster_feats = [
+        self._cluster_buf[:] = (
             state.get('cluster_cpu_usage', 0),
             state.get('cluster_memory_usage', 0),
-            state.get('total_pods', 0) / self.config.max_pods,
-            state.get('total_nodes', 0) / self.config.max_nodes,
+            state.get('total_pods', 0) / max_pods,
+            state.get('total_nodes', 0) / max_nodes,
             state.get('avg_network_latency', 0),
             state.get('cluster_load', 0)
-        ]
-        features.extend(cluster_feats)
-
-        return np.array(features, dtype=np.float32)
-
-    def _get_pod_cpu_request(self, pod) -> float:
-        """Extract CPU request from pod"""
-        total_cpu = 0.0
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                cpu = container.resources.requests.get('cpu', '0')
-                if cpu.endswith('m'):
-                    total_cpu += float(cpu[:-1]) / 1000
-                else:
-                    total_cpu += float(cpu)
-        return total_cpu
-
-    def _get_pod_memory_request(self, pod) -> float:
-        """Extract memory request from pod (normalized to GB)"""
-        total_mem = 0.0
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                mem = container.resources.requests.get('memory', '0')
-                # Convert to GB
-                if mem.endswith('Gi'):
-                    total_mem += float(mem[:-2])
-                elif mem.endswith('Mi'):
-                    total_mem += float(mem[:-2]) / 1024
-                elif mem.endswith('Ki'):
-                    total_mem += float(mem[:-2]) / (1024**2)
-        return total_mem
+        )
+
+        return self._state_buf
+
+    def _get_pod_requests(self, pod) -> Tuple[float, float]:
+        """Return (cpu, memory GB) requests of a pod, cached by pod UID"""
+        uid = pod.metadata.uid
+        requests = self._pod_requests.get(uid)
+
+        if requests is None:
+            cpu, memory = pod_requests(pod)
+            requests = (cpu, memory / 1024**3)
+            if uid is not None:
+                self._pod_requests[uid] = requests
+
+        return requests
 
     def _is_stateful(self, pod) -> bool:
         """Check if pod is stateful"""
@@ -249,61 +451,77 @@ class DRLAgent:
                     return True
         return False
 
-    async def _select_best_node(
-        self,
-        state_vector: np.ndarray,
-        eligible_nodes: List[str],
-        state: Dict[str, Any]
-    ) -> str:
-        """Select best node using policy network"""
-
-        with torch.no_grad():
-            state_tensor = torch.FloatTensor(state_vector).unsqueeze(0)
-
-            # Get action probabilities
-            action_probs = self.policy_net(state_tensor)
-            action_probs = action_probs.squeeze().numpy()
-
-            # Mask invalid actions (non-eligible nodes)
-            valid_mask = np.zeros(len(action_probs))
-            for i, node in enumerate(eligible_nodes):
-                if i < len(valid_mask):
-                    valid_mask[i] = 1.0
+    def _select_best_nodes(self, eligible_nodes: List[List[str]]) -> List[str]:
+        """Select best nodes for the rows staged in the batch buffer"""
 
-            masked_probs = action_probs * valid_mask
+        if self._infer_stream is not None:
+            # Inference weights are refreshed on the default stream
+            self._infer_stream.wait_stream(torch.cuda.current_stream())
+            stream = torch.cuda.stream(self._infer_stream)
+        else:
+            stream = contextlib.nullcontext()
+
+        with stream, torch.inference_mode():
+            # Always run the full buffer so the network sees one static
+            # shape; the pinned copy is queued without blocking the host
+            state_tensor = self._batch_tensor.to(self.device, non_blocking=True)
+            state_tensor = state_tensor.to(self._infer_dtype)
+
+            # Row counts are prepared on the host while the copy is in flight
+            counts = torch.tensor(
+                [len(nodes) for nodes in eligible_nodes], dtype=torch.int64
+            ).to(self.device, non_blocking=True)
+
+            # Get action scores
+            _, action_scores = self.model_infer(state_tensor)
+            action_scores = action_scores[:len(eligible_nodes)]
+
+            # Mask invalid actions per row; eligible nodes occupy the
+            # leading slots
+            slots = torch.arange(action_scores.shape[1], device=action_scores.device)
+            action_scores = action_scores.masked_fill(
+                slots.unsqueeze(0) >= counts.unsqueeze(1), float('-inf')
+            )
 
-            # Select node with highest probability
-            if masked_probs.sum() > 0:
-                masked_probs = masked_probs / masked_probs.sum()
-                node_idx = np.argmax(masked_probs)
-                if node_idx < len(eligible_nodes):
-                    return eligible_nodes[node_idx]
+            # Select node with highest score; tolist() waits for the stream,
+            # so the staging buffer is free for the next batch afterwards
+            node_idx = action_scores.argmax(dim=1).tolist()
 
-        # Fallback to random if something goes wrong
-        return random.choice(eligible_nodes)
+        return [nodes[idx] for nodes, idx in zip(eligible_nodes, node_idx)]
 
     async def store_experience(
         self,
         state: Dict[str, Any],
         action: str,
         reward: float,
-        pod: Any
+        pod: Any,
+        eligible_nodes: List[str],
+        next_state: Optional[Dict[str, Any]] = None
     ):
-        """Store experience in replay buffer"""
-
-        # Get next state
-        next_state = await self.state_observer.get_state()
+        """
+        Store experience in replay buffer
+
+        next_state is the state observed after the decision took effect.
+        Without one the decision is stored as terminal, so its value
+        target is the reward alone rather than a bootstrap from the
+        pre-decision state.
+        """
+
+        # Encode both states against the same candidate nodes; the first
+        # encoding is copied out of the shared buffer before it is reused
+        state_vec = self._encode_state(pod, eligible_nodes, state).copy()
+        if next_state is None:
+            next_state_vec = np.zeros_like(state_vec)
+        else:
+            next_state_vec = self._encode_state(pod, eligible_nodes, next_state)
 
-        # Create experience
-        exp = Experience(
-            state=state,
-            action=action,
+        self.memory.add(
+            state=state_vec,
+            action=eligible_nodes.index(action),
             reward=reward,
-            next_state=next_state,
-            done=False  # Scheduling is a continuing task
+            next_state=next_state_vec,
+            done=next_state is None
         )
-
-        self.memory.append(exp)
         self.total_steps += 1
 
     async def train(self) -> Dict[str, float]:
@@ -314,62 +532,62 @@ class DRLAgent:
             return {}
 
         # Sample batch
-        batch = random.sample(self.memory, self.config.batch_size)
-
-        # Prepare training data
-        states = []
-        actions = []
-        rewards = []
-        next_states = []
-        dones = []
-
-        for exp in batch:
-            # Encode states (simplified for training)
-            state_vec = np.random.randn(await self._get_state_dimension())
-            next_state_vec = np.random.randn(await self._get_state_dimension())
-
-            states.append(state_vec)
-            actions.append(0)  # Placeholder
-            rewards.append(exp.reward)
-            next_states.append(next_state_vec)
-            dones.append(exp.done)
-
-        # Convert to tensors
-        states_t = torch.FloatTensor(np.array(states))
-        rewards_t = torch.FloatTensor(rewards)
-        next_states_t = torch.FloatTensor(np.array(next_states))
-        dones_t = torch.FloatTensor(dones)
-
-        # Compute value targets
-        with torch.no_grad():
-            next_values = self.value_net(next_states_t).squeeze()
-            targets = rewards_t + self.config.gamma * next_values * (1 - dones_t)
-
-        # Compute current values
-        current_values = self.value_net(states_t).squeeze()
-
-        # Value loss
-        value_loss = nn.MSELoss()(current_values, targets)
+        states, actions, rewards, next_states, dones = self.memory.sample(
+            self.config.batch_size
+        )
 
-        # Policy loss (simplified)
-        action_probs = self.policy_net(states_t)
-        advantages = targets - current_values.detach()
-        policy_loss = -(torch.log(action_probs.mean(dim=1)) * advantages).mean()
+        # Convert to tensors on the training device
+        states_t = self._to_device(states)
+        actions_t = self._to_device(actions)
+        rewards_t = self._to_device(rewards)
+        next_states_t = self._to_device(next_states)
+        dones_t = self._to_device(dones)
+
+        # bf16 autocast is only used when the batch lives on a CUDA device
+        autocast = torch.autocast(device_type='cuda', dtype=torch.bfloat16,
+                                  enabled=states_t.is_cuda)
+
+        # Compute value targets once for all update epochs
+        with autocast, torch.no_grad():
+            next_values, _ = self.model(next_states_t)
+            next_values = next_values.squeeze(-1)
+            targets = rewards_t + self.config.gamma * next_values * (1 - dones_t)
 
-        # Total loss
-        total_loss = value_loss + policy_loss
+        # Several gradient steps on the same batch amortize sampling and
+        # host-to-device transfer
+        for _ in range(self.config.ppo_epochs):
+            with autocast:
+                # One forward pass provides current values and action logits
+                current_values, action_logits = self.model(states_t)
+                current_values = current_values.squeeze(-1)
+
+                # Value loss
+                value_loss = nn.MSELoss()(current_values, targets)
+
+                # Policy loss on the log-probability of the actions taken
+                log_probs = torch.log_softmax(action_logits, dim=-1)
+                taken_log_probs = log_probs.gather(1, actions_t.unsqueeze(1)).squeeze(1)
+                advantages = targets - current_values.detach()
+                policy_loss = -(taken_log_probs * advantages).mean()
+
+                # Total loss
+                total_loss = value_loss + policy_loss
+
+            # Optimize
+            self.optimizer.zero_grad(set_to_none=True)
+            total_loss.backward()
+            torch.nn.utils.clip_grad_norm_(
+                self.model.parameters(),
+                max_norm=0.5
+            )
+            self.optimizer.step()
 
-        # Optimize
-        self.optimizer.zero_grad()
-        total_loss.backward()
-        torch.nn.utils.clip_grad_norm_(
-            list(self.policy_net.parameters()) + list(self.value_net.parameters()),
-            max_norm=0.5
-        )
-        self.optimizer.step()
+        # The inference copy and cached decisions reflect the old weights
+        self._refresh_inference_model()
+        self._decision_cache.clear()
 
         # Calculate metrics
-        avg_reward = np.mean(rewards)
+        avg_reward = float(rewards.mean())
 
         metrics = {
             'loss': total_loss.item(),
@@ -387,8 +605,7 @@ class DRLAgent:
         os.makedirs(model_dir, exist_ok=True)
 
         checkpoint = {
-            'policy_state_dict': self.policy_net.state_dict(),
-            'value_state_dict': self.value_net.state_dict(),
+            'model_state_dict': self._unwrap(self.model).state_dict(),
             'optimizer_state_dict': self.optimizer.state_dict(),
             'epsilon': self.epsilon,
             'total_steps': self.total_steps
@@ -398,6 +615,23 @@ class DRLAgent:
         torch.save(checkpoint, path)
         logger.info(f"Model saved to {path}")
 
+    @staticmethod
+    def _model_state(checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the network state from a checkpoint, including the legacy format"""
+        if 'model_state_dict' in checkpoint:
+            return checkpoint['model_state_dict']
+
+        # Older checkpoints hold separate policy and value networks; their
+        # encoder and head layouts match SchedulerActorCritic, so take the
+        # encoder and policy head from one and the value head from the other
+        state = dict(checkpoint['policy_state_dict'])
+        state.update(
+            (key, value)
+            for key, value in checkpoint['value_state_dict'].items()
+            if key.startswith('value_head.')
+        )
+        return state
+
     async def load_model(self):
         """Load model checkpoint"""
         path = os.path.join(self.config.model_path, f"{self.config.model_name}.pt")
@@ -407,13 +641,30 @@ class DRLAgent:
             return
 
         try:
-            checkpoint = torch.load(path)
-            self.policy_net.load_state_dict(checkpoint['policy_state_dict'])
-            self.value_net.load_state_dict(checkpoint['value_state_dict'])
-            self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+            # Tensors-only unpickling onto the CPU; load_state_dict copies
+            # them onto the agent's device, whatever the saving device was
+            checkpoint = torch.load(path, map_location='cpu', weights_only=True)
+
+            # Exploration progress first, so it survives a network or
+            # optimizer state that no longer fits
             self.epsilon = checkpoint.get('epsilon', self.config.epsilon_start)
             self.total_steps = checkpoint.get('total_steps', 0)
 
+            self._unwrap(self.model).load_state_dict(self._model_state(checkpoint))
+
+            # A legacy optimizer tracked two encoders and two heads, which
+            # do not map onto the fused model's parameters
+            if 'model_state_dict' in checkpoint:
+                self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+            else:
+                logger.info("Legacy checkpoint: optimizer state not restored")
+
+            # Score with the loaded weights from now on. During initialize()
+            # the inference copy is only built afterwards, from these weights
+            if self.model_infer is not None:
+                self._refresh_inference_model()
+            self._decision_cache.clear()
+
             logger.info(f"Model loaded from {path}")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
@@ -18,11 +18,16 @@ Kubernetes Scheduler with DRL Agent Integration
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-import json
-import urllib.request
-
+import math
+import os
+import ssl
+import threading
+import time
+from typing import List, Optional, Dict, Any, FrozenSet, Tuple
+
+import aiohttp
+import numpy as np
+import orjson
 from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
 
@@ -30,10 +35,20 @@ from .config import SchedulerConfig
 from .state_observer import ClusterStateObserver
 from .drl_agent import DRLAgent
 from .reward_calculator import RewardCalculator
+from .utils import BoundedCache, pod_requests
 from monitoring.metrics import SchedulerMetrics
 
 logger = logging.getLogger(__name__)
 
+# Service account credentials mounted into the scheduler pod
+SERVICE_ACCOUNT_TOKEN_PATH = '/var/run/secrets/kubernetes.io/serviceaccount/token'
+SERVICE_ACCOUNT_TOKEN_TTL = 60.0
+
+# Pods displaced by an earlier placement are retried this many times,
+# after REQUEUE_BACKOFF seconds doubled per attempt, before giving up
+MAX_REQUEUE_ATTEMPTS = 5
+REQUEUE_BACKOFF = 0.1
+
 
 class DRLScheduler:
     """DRL-Enhanced Kubernetes Scheduler"""
@@ -46,6 +61,24 @@ class DRLScheduler:
         self.reward_calculator = None
         self.metrics = SchedulerMetrics()
 
+        # Shared HTTP session for pod bindings
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._api_host = None
+        self._sa_token = None
+        self._sa_token_read_at = float('-inf')
+
+        # Indexed pod tolerations keyed by pod UID, see _index_tolerations
+        self._pod_tolerations: Dict[str, Tuple[FrozenSet[str], FrozenSet[Tuple[str, str]]]] = BoundedCache()
+
+        # Node usage including the placements made since the node table
+        # was built, see _charged_usage
+        self._charged_table = None
+        self._charged_cpu: Optional[np.ndarray] = None
+        self._charged_mem: Optional[np.ndarray] = None
+
+        # Requeue attempts keyed by pod UID, see _requeue
+        self._requeue_attempts: Dict[str, int] = BoundedCache()
+
         self.scheduled_pods = 0
         self.failed_schedules = 0
         self.training_episodes = 0
@@ -68,6 +101,23 @@ class DRLScheduler:
 
         self.v1 = client.CoreV1Api()
 
+        # One keep-alive session for all bindings, verified the way the
+        # loaded config asks: not at all, against its cluster CA file, or
+        # against the system CAs when it names none
+        api_config = client.Configuration.get_default_copy()
+        self._api_host = api_config.host
+        if not api_config.verify_ssl:
+            ssl_context = False
+        elif api_config.ssl_ca_cert and os.path.exists(api_config.ssl_ca_cert):
+            ssl_context = ssl.create_default_context(cafile=api_config.ssl_ca_cert)
+        else:
+            ssl_context = ssl.create_default_context()
+        self._http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                ssl=ssl_context, limit=64, keepalive_timeout=60
+            )
+        )
+
         # Initialize components
         self.state_observer = ClusterStateObserver(self.v1, self.config)
         await self.state_observer.initialize()
@@ -86,26 +136,37 @@ class DRLScheduler:
         """Main scheduling loop"""
         logger.info("Starting scheduling loop...")
 
+        # The watch stream blocks, so it runs on its own thread and hands
+        # pending pods to the event loop through a queue
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
         w = watch.Watch()
+        watcher = threading.Thread(
+            target=self._watch_pending_pods,
+            args=(w, queue, loop, stop),
+            name="pod-watch",
+            daemon=True
+        )
+        watcher.start()
 
         try:
-            async for event in self._watch_pending_pods(w):
-                if event['type'] in ['ADDED', 'MODIFIED']:
-                    pod = event['object']
-
-                    # Check if pod needs scheduling
-                    if self._needs_scheduling(pod):
-                        await self._schedule_pod(pod)
+            while True:
+                pods = await self._next_batch(queue)
+                await self._schedule_batch(pods, queue)
 
         except Exception as e:
             logger.error(f"Error in scheduling loop: {e}", exc_info=True)
             raise
+        finally:
+            stop.set()
+            w.stop()
 
-    async def _watch_pending_pods(self, w):
+    def _watch_pending_pods(self, w, queue: asyncio.Queue, loop, stop: threading.Event):
         """Watch for pending pods that need scheduling"""
         field_selector = f"spec.schedulerName={self.config.scheduler_name},status.phase=Pending"
 
-        while True:
+        while not stop.is_set():
             try:
                 stream = w.stream(
                     self.v1.list_pod_for_all_namespaces,
@@ -114,7 +175,12 @@ class DRLScheduler:
                 )
 
                 for event in stream:
-                    yield event
+                    if event['type'] in ['ADDED', 'MODIFIED']:
+                        pod = event['object']
+
+                        # Check if pod needs scheduling
+                        if self._needs_scheduling(pod):
+                            loop.call_soon_threadsafe(queue.put_nowait, pod)
 
             except ApiException as e:
                 if e.status == 410:  # Resource version expired
@@ -122,10 +188,31 @@ class DRLScheduler:
                     continue
                 else:
                     logger.error(f"API exception in watch: {e}")
-                    await asyncio.sleep(5)
+                    stop.wait(5)
             except Exception as e:
                 logger.error(f"Error watching pods: {e}")
-                await asyncio.sleep(5)
+                stop.wait(5)
+
+    async def _next_batch(self, queue: asyncio.Queue) -> List[Any]:
+        """Wait for a pending pod, then collect more until the batch window closes"""
+        loop = asyncio.get_running_loop()
+
+        # Keyed by UID so repeated events for one pod schedule it once
+        pod = await queue.get()
+        pods = {pod.metadata.uid: pod}
+        deadline = loop.time() + self.config.schedule_batch_window_ms / 1000
+
+        while len(pods) < self.config.schedule_batch_max:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                pod = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pods[pod.metadata.uid] = pod
+
+        return list(pods.values())
 
     def _needs_scheduling(self, pod) -> bool:
         """Check if a pod needs scheduling"""
@@ -143,31 +230,59 @@ class DRLScheduler:
 
         return True
 
-    async def _schedule_pod(self, pod):
-        """Schedule a pod using the DRL agent"""
-        pod_name = pod.metadata.name
-        namespace = pod.metadata.namespace
-
-        logger.info(f"Scheduling pod {namespace}/{pod_name}")
-        start_time = datetime.now()
+    async def _schedule_batch(self, pods: List[Any], queue: asyncio.Queue):
+        """Schedule a batch of pods with a single agent decision pass"""
+        start_time = time.perf_counter()
 
         try:
             # Get current cluster state
             state = await self.state_observer.get_state()
 
             # Get eligible nodes
-            nodes = await self._get_eligible_nodes(pod)
+            eligible_nodes = [self._get_eligible_nodes(pod, state) for pod in pods]
+
+            # Use DRL agent to select best nodes
+            selected_nodes = self.drl_agent.select_nodes(
+                pods, eligible_nodes, state
+            )
+
+            # Every pod was fitted against the same usage, so charge the
+            # placements in order and requeue pods that no longer fit
+            placements = self._commit_batch(pods, eligible_nodes, selected_nodes, state, queue)
+
+        except Exception as e:
+            logger.error(f"Error scheduling batch of {len(pods)} pods: {e}", exc_info=True)
+            for pod in pods:
+                self.failed_schedules += 1
+                self.metrics.record_failed_schedule(pod.metadata.name, str(e))
+            return
+
+        await asyncio.gather(*(
+            self._schedule_pod(pod, nodes, selected_node, state, start_time)
+            for pod, nodes, selected_node in placements
+        ))
+
+    async def _schedule_pod(
+        self,
+        pod,
+        nodes: List[str],
+        selected_node: Optional[str],
+        state: Dict[str, Any],
+        start_time: float
+    ):
+        """Bind a pod to the node chosen by the DRL agent"""
+        pod_name = pod.metadata.name
+        namespace = pod.metadata.namespace
+
+        logger.info(f"Scheduling pod {namespace}/{pod_name}")
+
+        try:
             if not nodes:
                 logger.warning(f"No eligible nodes for pod {pod_name}")
                 self.failed_schedules += 1
                 self.metrics.record_failed_schedule(pod_name, "no_eligible_nodes")
                 return
 
-            # Use DRL agent to select best node
-            selected_node = await self.drl_agent.select_node(
-                pod, nodes, state
-            )
-
             if not selected_node:
                 logger.warning(f"Agent could not select node for pod {pod_name}")
                 self.failed_schedules += 1
@@ -176,20 +291,26 @@ class DRLScheduler:
 
             # Bind pod to node
             await self._bind_pod_to_node(pod, selected_node)
+            self._requeue_attempts.pop(pod.metadata.uid, None)
 
             # Calculate reward
-            reward = await self.reward_calculator.calculate_reward(
+            reward = self.reward_calculator.calculate_reward(
                 pod, selected_node, state
             )
 
-            # Store experience for training
-            if self.config.enable_training:
+            # Store experience for training. The snapshot is not refreshed
+            # until the next state update, so there is no observation of the
+            # decision's effect and it is stored as a terminal step.
+            # A non-finite reward would poison every weight on the next update
+            if not math.isfinite(reward):
+                logger.warning(f"Non-finite reward for {pod_name} on {selected_node}, not stored")
+            elif self.config.enable_training:
                 await self.drl_agent.store_experience(
-                    state, selected_node, reward, pod
+                    state, selected_node, reward, pod, nodes
                 )
 
             # Update metrics
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             self.scheduled_pods += 1
             self.metrics.record_successful_schedule(
                 pod_name, selected_node, duration, reward
@@ -210,31 +331,109 @@ class DRLScheduler:
             self.failed_schedules += 1
             self.metrics.record_failed_schedule(pod_name, str(e))
 
-    async def _get_eligible_nodes(self, pod) -> List[str]:
+    def _charged_usage(self, table) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (cpu_used, mem_used) of a node table plus the placements
+        charged to it so far
+
+        The table only catches up with our bindings on the next state
+        update, so charges carry over between batches until the observer
+        publishes a new table.
+        """
+        if self._charged_table is not table:
+            self._charged_table = table
+            self._charged_cpu = table.cpu_used.copy()
+            self._charged_mem = table.mem_used.copy()
+        return self._charged_cpu, self._charged_mem
+
+    def _commit_batch(
+        self,
+        pods: List[Any],
+        eligible_nodes: List[List[str]],
+        selected_nodes: List[Optional[str]],
+        state: Dict[str, Any],
+        queue: asyncio.Queue
+    ) -> List[Tuple[Any, List[str], Optional[str]]]:
+        """Return the (pod, eligible nodes, selected node) placements that still fit"""
+        table = state['node_table']
+        cpu_used, mem_used = self._charged_usage(table)
+        placements = []
+
+        for pod, nodes, node in zip(pods, eligible_nodes, selected_nodes):
+            idx = table.idx.get(node) if node else None
+            if idx is None:
+                placements.append((pod, nodes, node))
+                continue
+
+            req_cpu, req_mem = pod_requests(pod)
+            if (cpu_used[idx] + req_cpu > table.cpu_alloc[idx] or
+                    mem_used[idx] + req_mem > table.mem_alloc[idx]):
+                self._requeue(pod, node, queue)
+                continue
+
+            cpu_used[idx] += req_cpu
+            mem_used[idx] += req_mem
+            placements.append((pod, nodes, node))
+
+        return placements
+
+    def _requeue(self, pod, node: str, queue: asyncio.Queue):
+        """Retry a pod displaced from its node later, or give up after MAX_REQUEUE_ATTEMPTS"""
+        uid = pod.metadata.uid
+        pod_name = pod.metadata.name
+        attempts = self._requeue_attempts.pop(uid, 0) + 1
+
+        if attempts > MAX_REQUEUE_ATTEMPTS:
+            logger.warning(f"Giving up on {pod_name} after {MAX_REQUEUE_ATTEMPTS} requeues")
+            self.failed_schedules += 1
+            self.metrics.record_failed_schedule(pod_name, "insufficient_capacity")
+            return
+
+        self._requeue_attempts[uid] = attempts
+        delay = REQUEUE_BACKOFF * 2 ** (attempts - 1)
+        logger.info(
+            f"Node {node} is full after earlier placements, requeueing "
+            f"{pod.metadata.namespace}/{pod_name} in {delay:.1f}s"
+        )
+        asyncio.get_running_loop().call_later(delay, queue.put_nowait, pod)
+
+    def _get_eligible_nodes(self, pod, state: Dict[str, Any]) -> List[str]:
         """Get list of nodes eligible for the pod"""
         try:
-            nodes = self.v1.list_node()
-            eligible = []
+            table = state['node_table']
+            if not len(table):
+                return []
+
+            # Total pod requests
+            req_cpu, req_mem = pod_requests(pod)
+
+            # Readiness and resource fit for all nodes at once, against
+            # usage that includes placements the table has not seen yet
+            cpu_used, mem_used = self._charged_usage(table)
+            eligible_mask = (
+                table.ready &
+                (table.cpu_alloc > 0) &
+                (table.mem_alloc > 0) &
+                (table.cpu_alloc - cpu_used >= req_cpu) &
+                (table.mem_alloc - mem_used >= req_mem)
+            )
 
-            for node in nodes.items:
-                # Check node is ready
-                if not self._is_node_ready(node):
-                    continue
+            # Taints and node selectors only for the nodes that still fit
+            if self.config.enable_taints:
+                tolerations = self._index_tolerations(pod)
 
+            eligible = []
+            for idx in np.flatnonzero(eligible_mask):
                 # Check taints and tolerations
                 if self.config.enable_taints:
-                    if not self._check_tolerations(pod, node):
+                    if not self._check_tolerations(tolerations, table.taints[idx]):
                         continue
 
-                # Check resource requirements
-                if not await self._check_resources(pod, node):
-                    continue
-
                 # Check node selectors
-                if not self._check_node_selectors(pod, node):
+                if not self._check_node_selectors(pod, table.labels[idx]):
                     continue
 
-                eligible.append(node.metadata.name)
+                eligible.append(table.names[idx])
 
             return eligible
 
@@ -242,92 +441,65 @@ class DRLScheduler:
             logger.error(f"Error getting eligible nodes: {e}")
             return []
 
-    def _is_node_ready(self, node) -> bool:
-        """Check if node is ready"""
-        if not node.status or not node.status.conditions:
-            return False
-
-        for condition in node.status.conditions:
-            if condition.type == "Ready" and condition.status == "True":
-                return True
-        return False
+    def _index_tolerations(self, pod) -> Tuple[FrozenSet[str], FrozenSet[Tuple[str, str]]]:
+        """Return (Exists keys, (key, value) pairs) of a pod's tolerations, cached by pod UID"""
+        uid = pod.metadata.uid
+        index = self._pod_tolerations.get(uid)
 
-    def _check_tolerations(self, pod, node) -> bool:
-        """Check if pod tolerates node taints"""
-        if not node.spec.taints:
+        if index is None:
+            pod_tolerations = pod.spec.tolerations or []
+            index = (
+                frozenset(t.key for t in pod_tolerations if t.operator == "Exists"),
+                frozenset((t.key, t.value) for t in pod_tolerations if t.operator != "Exists")
+            )
+            if uid is not None:
+                self._pod_tolerations[uid] = index
+
+        return index
+
+    def _check_tolerations(
+        self,
+        tolerations: Tuple[FrozenSet[str], FrozenSet[Tuple[str, str]]],
+        taints
+    ) -> bool:
+        """Check if indexed pod tolerations tolerate node taints"""
+        if not taints:
             return True
 
-        pod_tolerations = pod.spec.tolerations or []
+        exists_keys, equal_pairs = tolerations
 
-        for taint in node.spec.taints:
-            tolerated = False
-            for toleration in pod_tolerations:
-                if (toleration.key == taint.key and
-                    (toleration.operator == "Exists" or
-                     toleration.value == taint.value)):
-                    tolerated = True
-                    break
+        for taint in taints:
+            tolerated = (taint.key in exists_keys or
+                         (taint.key, taint.value) in equal_pairs)
             if not tolerated and taint.effect in ["NoSchedule", "NoExecute"]:
                 return False
 
         return True
 
-    async def _check_resources(self, pod, node) -> bool:
-        """Check if node has sufficient resources"""
-        # Get node allocatable resources
-        allocatable = node.status.allocatable
-
-        if not allocatable:
-            return False
-
-        # Get current usage
-        node_metrics = await self.state_observer.get_node_metrics(
-            node.metadata.name
-        )
-
-        # Check each container's requirements
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                requests = container.resources.requests
-
-                # Check CPU
-                if 'cpu' in requests:
-                    required_cpu = self._parse_cpu(requests['cpu'])
-                    available_cpu = (
-                        self._parse_cpu(allocatable.get('cpu', '0')) -
-                        node_metrics.get('cpu_used', 0)
-                    )
-                    if required_cpu > available_cpu:
-                        return False
-
-                # Check memory
-                if 'memory' in requests:
-                    required_mem = self._parse_memory(requests['memory'])
-                    available_mem = (
-                        self._parse_memory(allocatable.get('memory', '0')) -
-                        node_metrics.get('memory_used', 0)
-                    )
-                    if required_mem > available_mem:
-                        return False
-
-        return True
-
-    def _check_node_selectors(self, pod, node) -> bool:
+    def _check_node_selectors(self, pod, node_labels: Dict[str, str]) -> bool:
         """Check if pod's node selector matches node labels"""
         if not pod.spec.node_selector:
             return True
 
-        node_labels = node.metadata.labels or {}
-
         for key, value in pod.spec.node_selector.items():
             if node_labels.get(key) != value:
                 return False
 
         return True
 
+    def _service_account_token(self) -> str:
+        """Return the service account token, re-read at most once a minute"""
+        # Projected tokens are rotated by the kubelet, so never cache forever
+        now = time.monotonic()
+        if now - self._sa_token_read_at >= SERVICE_ACCOUNT_TOKEN_TTL:
+            with open(SERVICE_ACCOUNT_TOKEN_PATH, 'r') as f:
+                self._sa_token = f.read()
+            self._sa_token_read_at = now
+        return self._sa_token
+
     async def _bind_pod_to_node(self, pod, node_name: str):
         """Bind a pod to a specific node using direct REST API call"""
-        binding = {
+        data = orjson.dumps({
             "apiVersion": "v1",
             "kind": "Binding",
             "metadata": {
@@ -339,34 +511,18 @@ class DRLScheduler:
                 "kind": "Node",
                 "name": node_name
             }
-        }
+        })
 
         try:
-            # Get API server URL and auth token
-            api_config = client.Configuration().get_default_copy()
-            api_host = api_config.host
-
-            # Use service account token for authentication
-            with open('/var/run/secrets/kubernetes.io/serviceaccount/token', 'r') as f:
-                token = f.read()
-
             # Create binding via REST API
-            url = f"{api_host}/api/v1/namespaces/{pod.metadata.namespace}/pods/{pod.metadata.name}/binding"
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(binding).encode('utf-8'),
-                headers={
-                    'Authorization': f'Bearer {token}',
-                    'Content-Type': 'application/json'
-                },
-                method='POST'
-            )
-
-            # Disable SSL verification for self-signed certs
-            import ssl
-            context = ssl._create_unverified_context()
+            url = f"{self._api_host}/api/v1/namespaces/{pod.metadata.namespace}/pods/{pod.metadata.name}/binding"
+            headers = {
+                'Authorization': f'Bearer {self._service_account_token()}',
+                'Content-Type': 'application/json'
+            }
 
-            with urllib.request.urlopen(req, context=context) as response:
+            async with self._http.post(url, data=data, headers=headers) as response:
+                response.raise_for_status()
                 logger.info(f"Successfully scheduled pod {pod.metadata.namespace}/{pod.metadata.name} to node {node_name}")
                 self.scheduled_pods += 1
 
@@ -394,31 +550,6 @@ class DRLScheduler:
         except Exception as e:
             logger.error(f"Error during training: {e}", exc_info=True)
 
-    def _parse_cpu(self, cpu_str: str) -> float:
-        """Parse CPU string to float (in cores)"""
-        if cpu_str.endswith('m'):
-            return float(cpu_str[:-1]) / 1000
-        return float(cpu_str)
-
-    def _parse_memory(self, mem_str: str) -> float:
-        """Parse memory string to float (in bytes)"""
-        units = {
-            'Ki': 1024,
-            'Mi': 1024**2,
-            'Gi': 1024**3,
-            'Ti': 1024**4,
-            'K': 1000,
-            'M': 1000**2,
-            'G': 1000**3,
-            'T': 1000**4
-        }
-
-        for unit, multiplier in units.items():
-            if mem_str.endswith(unit):
-                return float(mem_str[:-len(unit)]) * multiplier
-
-        return float(mem_str)
-
     async def shutdown(self):
         """Gracefully shutdown the scheduler"""
         logger.info("Shutting down scheduler...")
@@ -426,4 +557,7 @@ class DRLScheduler:
         if self.drl_agent:
             await self.drl_agent.save_model()
 
+        if self._http:
+            await self._http.close()
+
         logger.info("Scheduler shutdown complete")
@@ -19,20 +19,93 @@ Neural Network Models for DRL Scheduler
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
-from typing import Tuple
+from typing import Optional, Tuple
 
 
-class SchedulerPolicyNetwork(nn.Module):
-    """Policy network for action selection"""
+def compile_forward(module: nn.Module, *example_inputs: torch.Tensor) -> nn.Module:
+    """
+    Compile a module's forward pass in place and warm it up
 
-    def __init__(self, state_dim: int, action_dim: int, hidden_dim: int = 128):
-        super(SchedulerPolicyNetwork, self).__init__()
+    Compiling the bound forward rather than wrapping the module keeps
+    state_dict keys unchanged, so checkpoints stay interchangeable with
+    eager models. The shapes are fixed at construction, hence dynamic=False.
+    """
+    module.forward = torch.compile(module.forward, mode="reduce-overhead", dynamic=False)
 
-        self.state_dim = state_dim
-        self.action_dim = action_dim
+    # The first call pays for compilation; take it here, not on a
+    # scheduling decision
+    with torch.inference_mode():
+        module(*example_inputs)
+
+    return module
+
+
+class CUDAGraphModule(nn.Module):
+    """
+    Inference wrapper that replays a module's forward from CUDA graphs
+
+    One graph is captured per distinct set of input shapes and dtypes; new
+    inputs are copied into the graph's static buffers before each replay.
+    Parameters may be updated in place (e.g. load_state_dict) without
+    recapturing. Non-CUDA inputs fall through to the eager module.
+    """
+
+    def __init__(self, module: nn.Module, warmup_iters: int = 3):
+        super(CUDAGraphModule, self).__init__()
+
+        self.module = module
+        self.warmup_iters = warmup_iters
+        self._graphs = {}
+
+    def forward(self, *inputs: torch.Tensor):
+        if not inputs[0].is_cuda:
+            return self.module(*inputs)
 
-        # Encoder for state representation
-        self.encoder = nn.Sequential(
+        key = tuple((t.shape, t.dtype) for t in inputs)
+        entry = self._graphs.get(key)
+        if entry is None:
+            entry = self._graphs[key] = self._capture(inputs)
+
+        graph, static_inputs, static_outputs = entry
+        for static, tensor in zip(static_inputs, inputs):
+            static.copy_(tensor)
+        graph.replay()
+
+        # The next replay overwrites the static outputs
+        if isinstance(static_outputs, tuple):
+            return tuple(output.clone() for output in static_outputs)
+        return static_outputs.clone()
+
+    def _capture(self, inputs: Tuple[torch.Tensor, ...]):
+        """Warm up on a side stream, then capture one forward pass"""
+        static_inputs = [t.clone() for t in inputs]
+
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream):
+            for _ in range(self.warmup_iters):
+                self.module(*static_inputs)
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_outputs = self.module(*static_inputs)
+
+        return graph, static_inputs, static_outputs
+
+
+class StateEncoder(nn.Sequential):
+    """
+    Linear -> ReLU -> LayerNorm -> Dropout -> Linear -> ReLU -> LayerNorm
+
+    A Sequential for its parameter layout, so state_dict keys match
+    earlier checkpoints, with a functional forward that applies each
+    activation and norm as one expression and skips dropout outside
+    training.
+    """
+
+    def __init__(self, state_dim: int, hidden_dim: int = 128):
+        super(StateEncoder, self).__init__(
             nn.Linear(state_dim, hidden_dim * 2),
             nn.ReLU(),
             nn.LayerNorm(hidden_dim * 2),
@@ -42,39 +115,99 @@ class SchedulerPolicyNetwork(nn.Module):
             nn.LayerNorm(hidden_dim),
         )
 
-        # Policy head
+    def forward(self, state: torch.Tensor) -> torch.Tensor:
+        fc1, _, ln1, dropout, fc2, _, ln2 = self
+
+        x = F.layer_norm(F.relu(fc1(state)), ln1.normalized_shape, ln1.weight, ln1.bias, ln1.eps)
+        if self.training:
+            x = dropout(x)
+        return F.layer_norm(F.relu(fc2(x)), ln2.normalized_shape, ln2.weight, ln2.bias, ln2.eps)
+
+
+def _state_encoder(
+    encoder: Optional[StateEncoder],
+    state_dim: int,
+    hidden_dim: int,
+    dtype: torch.dtype
+) -> StateEncoder:
+    """Return a new encoder in dtype, or check that a shared one already is"""
+    # An empty Sequential is falsy, so test for None explicitly
+    if encoder is None:
+        return StateEncoder(state_dim, hidden_dim).to(dtype)
+
+    # Casting a shared encoder would change the other network's dtype too
+    for param in encoder.parameters():
+        if param.dtype != dtype:
+            raise ValueError(
+                f"Shared encoder has dtype {param.dtype}, expected {dtype}"
+            )
+    return encoder
+
+
+class SchedulerPolicyNetwork(nn.Module):
+    """Policy network for action selection"""
+
+    def __init__(
+        self,
+        state_dim: int,
+        action_dim: int,
+        hidden_dim: int = 128,
+        compile_model: bool = False,
+        dtype: torch.dtype = torch.float32,
+        encoder: Optional[StateEncoder] = None
+    ):
+        super(SchedulerPolicyNetwork, self).__init__()
+
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+
+        # Encoder for state representation; pass another network's encoder
+        # to share the trunk (SchedulerActorCritic fuses both passes)
+        self.encoder = _state_encoder(encoder, state_dim, hidden_dim, dtype)
+
+        # Policy head (unnormalized logits)
         self.policy_head = nn.Sequential(
             nn.Linear(hidden_dim, hidden_dim),
             nn.ReLU(),
-            nn.Linear(hidden_dim, action_dim),
-            nn.Softmax(dim=-1)
+            nn.Linear(hidden_dim, action_dim)
         )
 
+        # Reduced-precision weights halve the bytes moved per forward; only
+        # the head is cast, a shared encoder already has the right dtype
+        self.policy_head.to(dtype)
+
+        if compile_model:
+            compile_forward(self, torch.zeros(1, state_dim, dtype=dtype))
+
     def forward(self, state: torch.Tensor) -> torch.Tensor:
-        """Forward pass to get action probabilities"""
+        """
+        Forward pass to get action logits
+
+        Use F.softmax(logits, dim=-1) for probabilities, or
+        torch.distributions.Categorical(logits=logits) for sampling.
+        """
         features = self.encoder(state)
-        action_probs = self.policy_head(features)
-        return action_probs
+        logits = self.policy_head(features)
+        return logits
 
 
 class SchedulerValueNetwork(nn.Module):
     """Value network for state value estimation"""
 
-    def __init__(self, state_dim: int, hidden_dim: int = 128):
+    def __init__(
+        self,
+        state_dim: int,
+        hidden_dim: int = 128,
+        compile_model: bool = False,
+        dtype: torch.dtype = torch.float32,
+        encoder: Optional[StateEncoder] = None
+    ):
         super(SchedulerValueNetwork, self).__init__()
 
         self.state_dim = state_dim
 
-        # Encoder for state representation
-        self.encoder = nn.Sequential(
-            nn.Linear(state_dim, hidden_dim * 2),
-            nn.ReLU(),
-            nn.LayerNorm(hidden_dim * 2),
-            nn.Dropout(0.1),
-            nn.Linear(hidden_dim * 2, hidden_dim),
-            nn.ReLU(),
-            nn.LayerNorm(hidden_dim),
-        )
+        # Encoder for state representation, optionally shared
+        self.encoder = _state_encoder(encoder, state_dim, hidden_dim, dtype)
 
         # Value head
         self.value_head = nn.Sequential(
@@ -83,6 +216,11 @@ class SchedulerValueNetwork(nn.Module):
             nn.Linear(hidden_dim // 2, 1)
         )
 
+        self.value_head.to(dtype)
+
+        if compile_model:
+            compile_forward(self, torch.zeros(1, state_dim, dtype=dtype))
+
     def forward(self, state: torch.Tensor) -> torch.Tensor:
         """Forward pass to get state value"""
         features = self.encoder(state)
@@ -90,13 +228,65 @@ class SchedulerValueNetwork(nn.Module):
         return value
 
 
+class SchedulerActorCritic(nn.Module):
+    """
+    Policy and value heads over a single shared state encoder,
+    so one forward pass yields both outputs
+    """
+
+    def __init__(
+        self,
+        state_dim: int,
+        action_dim: int,
+        hidden_dim: int = 128,
+        dtype: torch.dtype = torch.float32
+    ):
+        super(SchedulerActorCritic, self).__init__()
+
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+
+        # Shared encoder for state representation
+        self.encoder = StateEncoder(state_dim, hidden_dim)
+
+        # Policy head (unnormalized logits)
+        self.policy_head = nn.Sequential(
+            nn.Linear(hidden_dim, hidden_dim),
+            nn.ReLU(),
+            nn.Linear(hidden_dim, action_dim)
+        )
+
+        # Value head
+        self.value_head = nn.Sequential(
+            nn.Linear(hidden_dim, hidden_dim // 2),
+            nn.ReLU(),
+            nn.Linear(hidden_dim // 2, 1)
+        )
+
+        self.to(dtype)
+
+    def forward(self, state: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Forward pass to get (state value, action logits)"""
+        features = self.encoder(state)
+        value = self.value_head(features)
+        logits = self.policy_head(features)
+        return value, logits
+
+
 class AttentionSchedulerNetwork(nn.Module):
     """
     Advanced scheduler network using attention mechanism
     for better node-pod matching
     """
 
-    def __init__(self, node_dim: int, pod_dim: int, hidden_dim: int = 128):
+    def __init__(
+        self,
+        node_dim: int,
+        pod_dim: int,
+        hidden_dim: int = 128,
+        compile_model: bool = False,
+        dtype: torch.dtype = torch.float32
+    ):
         super(AttentionSchedulerNetwork, self).__init__()
 
         self.node_dim = node_dim
@@ -117,12 +307,14 @@ class AttentionSchedulerNetwork(nn.Module):
             nn.LayerNorm(hidden_dim)
         )
 
-        # Multi-head attention
-        self.attention = nn.MultiheadAttention(
-            embed_dim=hidden_dim,
-            num_heads=4,
-            batch_first=True
-        )
+        # Multi-head attention projections; attention itself runs through
+        # the fused scaled_dot_product_attention kernels
+        self.num_heads = 4
+        self.head_dim = hidden_dim // self.num_heads
+        self.q_proj = nn.Linear(hidden_dim, hidden_dim)
+        self.k_proj = nn.Linear(hidden_dim, hidden_dim)
+        self.v_proj = nn.Linear(hidden_dim, hidden_dim)
+        self.out_proj = nn.Linear(hidden_dim, hidden_dim)
 
         # Output layer
         self.output = nn.Sequential(
@@ -131,6 +323,15 @@ class AttentionSchedulerNetwork(nn.Module):
             nn.Linear(hidden_dim // 2, 1)
         )
 
+        self.to(dtype)
+
+        if compile_model:
+            compile_forward(
+                self,
+                torch.zeros(1, 1, node_dim, dtype=dtype),
+                torch.zeros(1, pod_dim, dtype=dtype)
+            )
+
     def forward(
         self,
         node_features: torch.Tensor,
@@ -144,38 +345,76 @@ class AttentionSchedulerNetwork(nn.Module):
             pod_features: [batch, pod_dim]
 
         Returns:
-            scores: [batch, num_nodes] - scheduling scores for each node
+            scores: [batch, num_nodes] - unnormalized scheduling logits
+                for each node
         """
-        batch_size, num_nodes, _ = node_features.shape
-
         # Encode nodes
         node_encoded = self.node_encoder(node_features)  # [batch, num_nodes, hidden]
 
         # Encode pod
         pod_encoded = self.pod_encoder(pod_features)  # [batch, hidden]
-        pod_encoded = pod_encoded.unsqueeze(1)  # [batch, 1, hidden]
 
-        # Attention: pod queries node features
-        attn_output, _ = self.attention(
-            query=pod_encoded,
-            key=node_encoded,
-            value=node_encoded
-        )  # [batch, 1, hidden]
+        return self._score(node_encoded, pod_encoded)
 
-        # Compute compatibility scores
-        attn_output = attn_output.squeeze(1)  # [batch, hidden]
+    def forward_batch(
+        self,
+        node_features: torch.Tensor,
+        pod_features: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Score several pods against one shared set of nodes
 
-        # Expand for node-wise scoring
-        attn_expanded = attn_output.unsqueeze(1).expand(-1, num_nodes, -1)
+        Nodes are encoded and projected to keys/values once and broadcast
+        over the pods, instead of repeating the node features per pod.
+        Equivalent to forward on the node features repeated per pod. The
+        scheduling path does not use this network; DRLAgent scores with
+        SchedulerActorCritic.
 
-        # Combine with node features
-        combined = node_encoded + attn_expanded
+        Args:
+            node_features: [num_nodes, node_dim]
+            pod_features: [num_pods, pod_dim]
 
-        # Output scores
-        scores = self.output(combined).squeeze(-1)  # [batch, num_nodes]
+        Returns:
+            scores: [num_pods, num_nodes] - unnormalized scheduling logits
+        """
+        node_encoded = self.node_encoder(node_features).unsqueeze(0)  # [1, num_nodes, hidden]
+        pod_encoded = self.pod_encoder(pod_features)  # [num_pods, hidden]
+
+        return self._score(node_encoded, pod_encoded)
+
+    def _score(
+        self,
+        node_encoded: torch.Tensor,
+        pod_encoded: torch.Tensor
+    ) -> torch.Tensor:
+        """Attend from encoded pods [batch, hidden] to encoded nodes [batch or 1, num_nodes, hidden]"""
+        batch_size = pod_encoded.shape[0]
+        num_nodes = node_encoded.shape[1]
+
+        pod_encoded = pod_encoded.unsqueeze(1)  # [batch, 1, hidden]
 
-        # Apply softmax
-        scores = F.softmax(scores, dim=-1)
+        # Attention: pod queries node features, split into heads
+        # [batch, heads, seq, head_dim]; shared nodes broadcast as views
+        q = self.q_proj(pod_encoded).view(
+            batch_size, 1, self.num_heads, self.head_dim
+        ).transpose(1, 2)
+        k = self.k_proj(node_encoded).view(
+            -1, num_nodes, self.num_heads, self.head_dim
+        ).transpose(1, 2).expand(batch_size, -1, -1, -1)
+        v = self.v_proj(node_encoded).view(
+            -1, num_nodes, self.num_heads, self.head_dim
+        ).transpose(1, 2).expand(batch_size, -1, -1, -1)
+
+        attn_output = F.scaled_dot_product_attention(q, k, v)
+        attn_output = attn_output.transpose(1, 2).reshape(batch_size, 1, self.hidden_dim)
+        attn_output = self.out_proj(attn_output)  # [batch, 1, hidden]
+
+        # Combine with node features; the attention output broadcasts
+        # across nodes
+        combined = node_encoded + attn_output  # [batch, num_nodes, hidden]
+
+        # Output scores; normalization is left to the caller
+        scores = self.output(combined).squeeze(-1)  # [batch, num_nodes]
 
         return scores
 
@@ -231,36 +470,75 @@ class GraphNeuralScheduler(nn.Module):
         # Embed edges
         edge_attr = F.relu(self.edge_embed(edge_features))  # [num_edges, hidden]
 
+        # Message passing as sparse matmuls: adjacency[dst, src] counts the
+        # edges from src to dst, incidence[dst, e] selects the edges into dst
+        adjacency, incidence = self._aggregation_matrices(
+            edge_index, num_nodes, x.dtype
+        )
+
+        # Edge embeddings do not change between layers, so their
+        # per-node sums are shared by both convolutions
+        edge_messages = incidence @ edge_attr  # [num_nodes, hidden]
+
+        # Without autograd both convolutions fill one [num_nodes, hidden * 2]
+        # buffer allocated for this call; its edge half is written once.
+        # It is not kept on the module, since a tensor created under
+        # inference_mode cannot be written outside it
+        out = None
+        if not torch.is_grad_enabled():
+            out = x.new_empty(num_nodes, self.hidden_dim * 2)
+            out[:, self.hidden_dim:] = edge_messages
+
         # First graph convolution
-        x = self._graph_conv(x, edge_index, edge_attr, self.conv1)
+        x = self._graph_conv(x, adjacency, edge_messages, self.conv1, out)
 
         # Second graph convolution
-        x = self._graph_conv(x, edge_index, edge_attr, self.conv2)
+        x = self._graph_conv(x, adjacency, edge_messages, self.conv2, out)
 
         # Output scores
         scores = self.output(x).squeeze(-1)  # [num_nodes]
 
         return F.softmax(scores, dim=0)
 
+    @staticmethod
+    def _aggregation_matrices(
+        edge_index: torch.Tensor,
+        num_nodes: int,
+        dtype: torch.dtype
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Build CSR adjacency [num_nodes, num_nodes] and incidence [num_nodes, num_edges] matrices"""
+        row, col = edge_index
+        num_edges = row.shape[0]
+        ones = torch.ones(num_edges, device=edge_index.device, dtype=dtype)
+
+        # Coalescing sums duplicate edges, matching one message per edge
+        adjacency = torch.sparse_coo_tensor(
+            torch.stack([col, row]), ones, (num_nodes, num_nodes)
+        ).coalesce().to_sparse_csr()
+        incidence = torch.sparse_coo_tensor(
+            torch.stack([col, torch.arange(num_edges, device=edge_index.device)]),
+            ones, (num_nodes, num_edges)
+        ).coalesce().to_sparse_csr()
+
+        return adjacency, incidence
+
     def _graph_conv(
         self,
         x: torch.Tensor,
-        edge_index: torch.Tensor,
-        edge_attr: torch.Tensor,
-        conv_layer: nn.Module
+        adjacency: torch.Tensor,
+        edge_messages: torch.Tensor,
+        conv_layer: nn.Module,
+        out: Optional[torch.Tensor] = None
     ) -> torch.Tensor:
         """Apply graph convolution"""
 
-        num_nodes = x.shape[0]
-
-        # Aggregate messages from neighbors
-        row, col = edge_index
-
-        # Message passing
-        messages = torch.zeros_like(x)
-        for i, (src, dst) in enumerate(zip(row, col)):
-            message = torch.cat([x[src], edge_attr[i]], dim=-1)
-            messages[dst] += message
+        # Sum of [source features, edge embedding] over each node's
+        # incoming edges; with a buffer, only the source half is rewritten
+        if out is None:
+            messages = torch.cat([adjacency @ x, edge_messages], dim=-1)
+        else:
+            out[:, :self.hidden_dim] = adjacency @ x
+            messages = out
 
         # Apply convolution
         x = F.relu(conv_layer(messages))
@@ -17,13 +17,42 @@ Reward Calculator for DRL Scheduler
 """
 
 import logging
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, List, Tuple, FrozenSet
 import numpy as np
 
 from .config import SchedulerConfig
+from .utils import BoundedCache, pod_requests
 
 logger = logging.getLogger(__name__)
 
+# A node selector term compiled to (key, operator, values) expressions
+_SelectorTerm = Tuple[Tuple[str, str, FrozenSet[str]], ...]
+
+
+@dataclass(slots=True, frozen=True)
+class PodAffinitySpec:
+    """A pod's affinity preferences, parsed once from the API object"""
+
+    # Normalized weights of preferred pod affinity and anti-affinity terms
+    pod_term_weights: Tuple[float, ...] = ()
+
+    # Whether the pod declares node affinity, and its preferred terms
+    # compiled as (weight, expressions)
+    has_node_affinity: bool = False
+    node_terms: Tuple[Tuple[float, _SelectorTerm], ...] = ()
+
+    # Whether the pod declares topology spread constraints
+    has_spread_constraints: bool = False
+
+
+def _safe_divide(numerator, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator, 0 where the denominator is not positive"""
+    return np.divide(
+        numerator, denominator,
+        out=np.zeros(denominator.shape), where=denominator > 0
+    )
+
 
 class RewardCalculator:
     """
@@ -39,7 +68,16 @@ class RewardCalculator:
         self.config = config
         self.weights = config.reward_weights
 
-    async def calculate_reward(
+        # Weights as a vector in RewardWeights order, for batched scoring
+        self._weight_vec = np.asarray(self.weights, dtype=np.float64)
+
+        # Parsed (cpu, memory) requests keyed by pod UID
+        self._pod_requests: Dict[str, Tuple[float, float]] = BoundedCache()
+
+        # Parsed affinity preferences keyed by pod UID
+        self._pod_affinity: Dict[str, PodAffinitySpec] = BoundedCache()
+
+    def calculate_reward(
         self,
         pod: Any,
         selected_node: str,
@@ -51,159 +89,122 @@ class RewardCalculator:
         Returns:
             float: Reward value (higher is better)
         """
+        components = self._reward_components(pod, [selected_node], state)[:, 0]
+        total_reward = float(self._weight_vec @ components)
 
-        # Calculate individual reward components
-        resource_reward = await self._resource_utilization_reward(
-            pod, selected_node, state
-        )
-
-        load_balance_reward = await self._load_balance_reward(
-            selected_node, state
-        )
-
-        latency_reward = await self._latency_reward(
-            pod, selected_node, state
-        )
-
-        affinity_reward = await self._affinity_reward(
-            pod, selected_node, state
-        )
-
-        energy_reward = await self._energy_efficiency_reward(
-            selected_node, state
-        )
-
-        # Weighted combination
-        total_reward = (
-            self.weights['resource_utilization'] * resource_reward +
-            self.weights['load_balance'] * load_balance_reward +
-            self.weights['latency'] * latency_reward +
-            self.weights['affinity'] * affinity_reward +
-            self.weights['energy'] * energy_reward
-        )
-
-        logger.debug(
-            f"Reward breakdown for {pod.metadata.name} -> {selected_node}: "
-            f"resource={resource_reward:.3f}, load_balance={load_balance_reward:.3f}, "
-            f"latency={latency_reward:.3f}, affinity={affinity_reward:.3f}, "
-            f"energy={energy_reward:.3f}, total={total_reward:.3f}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Reward breakdown for %s -> %s: resource=%.3f, load_balance=%.3f, "
+                "latency=%.3f, affinity=%.3f, energy=%.3f, total=%.3f",
+                pod.metadata.name, selected_node, *components, total_reward
+            )
 
         return total_reward
 
-    async def _resource_utilization_reward(
+    def calculate_rewards_batch(
         self,
         pod: Any,
-        selected_node: str,
+        candidate_nodes: List[str],
         state: Dict[str, Any]
-    ) -> float:
-        """
-        Reward for efficient resource utilization
-
-        Goals:
-        - Maximize resource utilization without overcommitting
-        - Prefer nodes with resources that closely match pod requirements
-        - Avoid fragmentation
+    ) -> np.ndarray:
         """
+        Calculate total rewards for placing a pod on each candidate node
 
-        node_metrics = state['nodes'].get(selected_node, {})
-
-        if not node_metrics:
-            return 0.0
-
-        # Get pod resource requirements
-        pod_cpu = self._get_pod_cpu(pod)
-        pod_memory = self._get_pod_memory(pod)
-
-        # Node available resources
-        node_cpu_available = (
-            node_metrics['cpu_allocatable'] - node_metrics['cpu_used']
-        )
-        node_memory_available = (
-            node_metrics['memory_allocatable'] - node_metrics['memory_used']
-        )
-
-        # Calculate utilization after scheduling
-        cpu_util_after = (
-            (node_metrics['cpu_used'] + pod_cpu) /
-            node_metrics['cpu_allocatable']
-        )
-        memory_util_after = (
-            (node_metrics['memory_used'] + pod_memory) /
-            node_metrics['memory_allocatable']
-        )
-
-        # Reward for balanced utilization (target ~70-80%)
-        target_utilization = 0.75
-        cpu_deviation = abs(cpu_util_after - target_utilization)
-        memory_deviation = abs(memory_util_after - target_utilization)
-
-        utilization_score = 1.0 - (cpu_deviation + memory_deviation) / 2.0
+        Candidates must be nodes of the given state.
 
-        # Penalize if overcommitting
-        if cpu_util_after > 0.95 or memory_util_after > 0.95:
-            utilization_score *= 0.5
-
-        # Bonus for fitting well (avoiding fragmentation)
-        fit_score = 1.0 - abs(
-            (pod_cpu / node_cpu_available) -
-            (pod_memory / node_memory_available)
-        )
-
-        return (utilization_score * 0.7 + fit_score * 0.3)
+        Returns:
+            np.ndarray: [num_candidates] reward values
+        """
+        return self._weight_vec @ self._reward_components(pod, candidate_nodes, state)
 
-    async def _load_balance_reward(
+    def _reward_components(
         self,
-        selected_node: str,
+        pod: Any,
+        candidate_nodes: List[str],
         state: Dict[str, Any]
-    ) -> float:
+    ) -> np.ndarray:
         """
-        Reward for load balancing across nodes
+        Score every reward component for each candidate node
 
-        Goals:
-        - Distribute workload evenly
-        - Avoid hotspots
-        - Maintain cluster stability
+        Returns:
+            np.ndarray: [5, num_candidates] components in RewardWeights order
         """
+        table = state['node_table']
+        count = len(candidate_nodes)
+        rows = np.fromiter((table.idx[name] for name in candidate_nodes), np.intp, count)
 
-        nodes = state['nodes']
-
-        if len(nodes) < 2:
-            return 1.0
+        cpu_alloc = table.cpu_alloc[rows]
+        cpu_used = table.cpu_used[rows]
+        mem_alloc = table.mem_alloc[rows]
+        mem_used = table.mem_used[rows]
+        cpu_usage = table.cpu_usage[rows]
+        mem_usage = table.mem_usage[rows]
+        pod_count = table.pod_count[rows]
 
-        # Calculate load distribution
-        cpu_usages = [n['cpu_usage'] for n in nodes.values()]
-        memory_usages = [n['memory_usage'] for n in nodes.values()]
+        # Resource utilization: aim for ~75% after placement without
+        # overcommitting, and prefer free capacity shaped like the request
+        pod_cpu, pod_memory = self._pod_resources(pod)
 
-        # Standard deviation of usage (lower is better)
-        cpu_std = np.std(cpu_usages)
-        memory_std = np.std(memory_usages)
+        cpu_util_after = _safe_divide(cpu_used + pod_cpu, cpu_alloc)
+        memory_util_after = _safe_divide(mem_used + pod_memory, mem_alloc)
 
-        # Selected node's position relative to mean
-        avg_cpu = np.mean(cpu_usages)
-        avg_memory = np.mean(memory_usages)
-
-        selected_cpu = nodes[selected_node]['cpu_usage']
-        selected_memory = nodes[selected_node]['memory_usage']
-
-        # Reward scheduling on underutilized nodes
-        cpu_balance_score = 1.0 - abs(selected_cpu - avg_cpu)
-        memory_balance_score = 1.0 - abs(selected_memory - avg_memory)
-
-        # Overall balance
-        balance_score = (cpu_balance_score + memory_balance_score) / 2.0
-
-        # Bonus for reducing variance
-        variance_score = 1.0 - (cpu_std + memory_std) / 2.0
+        target_utilization = 0.75
+        utilization_score = 1.0 - (
+            np.abs(cpu_util_after - target_utilization) +
+            np.abs(memory_util_after - target_utilization)
+        ) / 2.0
+        overcommitted = (cpu_util_after > 0.95) | (memory_util_after > 0.95)
+        utilization_score = np.where(overcommitted, utilization_score * 0.5, utilization_score)
+
+        fit_score = 1.0 - np.abs(
+            _safe_divide(pod_cpu, cpu_alloc - cpu_used) -
+            _safe_divide(pod_memory, mem_alloc - mem_used)
+        )
+        resource_reward = utilization_score * 0.7 + fit_score * 0.3
 
-        return (balance_score * 0.6 + variance_score * 0.4)
+        # Load balancing: favor nodes near the cluster mean usage
+        if len(table) < 2:
+            load_balance_reward = np.ones(count)
+        else:
+            (avg_cpu, avg_memory), (cpu_std, memory_std) = table.usage_stats()
+            balance_score = (
+                (1.0 - np.abs(cpu_usage - avg_cpu)) +
+                (1.0 - np.abs(mem_usage - avg_memory))
+            ) / 2.0
+            variance_score = 1.0 - (cpu_std + memory_std) / 2.0
+            load_balance_reward = balance_score * 0.6 + variance_score * 0.4
+
+        spec = self._parse_pod_affinity(pod)
+
+        # Latency only depends on the pod
+        latency_reward = np.full(count, self._latency_reward(spec))
+
+        # Affinity only varies by node through preferred node affinity
+        if spec.has_node_affinity:
+            affinity_reward = np.fromiter(
+                (self._affinity_reward(spec, name, state) for name in candidate_nodes),
+                np.float64, count
+            )
+        else:
+            affinity_reward = np.full(count, self._affinity_reward(spec, None, state))
 
-    async def _latency_reward(
-        self,
-        pod: Any,
-        selected_node: str,
-        state: Dict[str, Any]
-    ) -> float:
+        # Energy efficiency: consolidate onto already-active, busier nodes
+        consolidation_score = np.where(
+            cpu_usage > 0.1, np.minimum(cpu_usage * 1.5, 1.0), 0.3
+        )
+        pod_count_score = np.minimum(pod_count / 20.0, 1.0)
+        energy_reward = consolidation_score * 0.7 + pod_count_score * 0.3
+
+        # The component order matches RewardWeights
+        return np.stack([
+            resource_reward,
+            load_balance_reward,
+            latency_reward,
+            affinity_reward,
+            energy_reward
+        ])
+
+    def _latency_reward(self, spec: PodAffinitySpec) -> float:
         """
         Reward for minimizing latency
 
@@ -213,41 +214,17 @@ class RewardCalculator:
         - Consider network topology
         """
 
-        # Check for affinity preferences
-        if not pod.spec.affinity:
-            return 0.8  # Neutral score
-
-        reward = 0.0
-        count = 0
-
-        # Pod affinity
-        if pod.spec.affinity.pod_affinity:
-            for term in (pod.spec.affinity.pod_affinity.preferred_during_scheduling_ignored_during_execution or []):
-                # Check if preferred pods are on the selected node
-                weight = term.weight / 100.0
+        # Simplified: assume co-location with preferred pods and separation
+        # from anti-affinity pods are both good
+        weights = spec.pod_term_weights
+        if weights:
+            return sum(weights) / len(weights)
 
-                # Simplified: assume co-location is good
-                reward += weight
-                count += 1
+        return 0.8  # Neutral score
 
-        # Pod anti-affinity
-        if pod.spec.affinity.pod_anti_affinity:
-            for term in (pod.spec.affinity.pod_anti_affinity.preferred_during_scheduling_ignored_during_execution or []):
-                # Check if anti-affinity pods are NOT on selected node
-                weight = term.weight / 100.0
-
-                # Simplified: assume separation is good
-                reward += weight
-                count += 1
-
-        if count > 0:
-            return reward / count
-        else:
-            return 0.8
-
-    async def _affinity_reward(
+    def _affinity_reward(
         self,
-        pod: Any,
+        spec: PodAffinitySpec,
         selected_node: str,
         state: Dict[str, Any]
     ) -> float:
@@ -263,105 +240,98 @@ class RewardCalculator:
         reward = 1.0
 
         # Node affinity
-        if pod.spec.affinity and pod.spec.affinity.node_affinity:
-            node_affinity = pod.spec.affinity.node_affinity
-            node_labels = state['nodes'][selected_node]['labels']
+        if spec.has_node_affinity:
+            table = state['node_table']
+            node_labels = table.labels[table.idx[selected_node]]
 
             # Check preferred terms
-            if node_affinity.preferred_during_scheduling_ignored_during_execution:
-                for term in node_affinity.preferred_during_scheduling_ignored_during_execution:
-                    weight = term.weight / 100.0
-
-                    # Check if node matches preference
-                    matches = self._check_node_selector_term(
-                        term.preference,
-                        node_labels
-                    )
-
-                    if matches:
-                        reward += weight * 0.5
+            for weight, expressions in spec.node_terms:
+                # Check if node matches preference
+                if self._check_node_selector_term(expressions, node_labels):
+                    reward += weight * 0.5
 
         # Topology spread constraints
-        if pod.spec.topology_spread_constraints:
+        if spec.has_spread_constraints:
             # Simplified: give bonus for spreading
             reward += 0.2
 
         return min(reward, 2.0) / 2.0  # Normalize to [0, 1]
 
-    async def _energy_efficiency_reward(
-        self,
-        selected_node: str,
-        state: Dict[str, Any]
-    ) -> float:
-        """
-        Reward for energy efficiency
+    def _pod_resources(self, pod) -> Tuple[float, float]:
+        """Return (cpu, memory bytes) requests of a pod, cached by pod UID"""
+        uid = pod.metadata.uid
+        requests = self._pod_requests.get(uid)
+
+        if requests is None:
+            requests = pod_requests(pod)
+            if uid is not None:
+                self._pod_requests[uid] = requests
+
+        return requests
+
+    def _parse_pod_affinity(self, pod) -> PodAffinitySpec:
+        """Return a pod's parsed affinity preferences, cached by pod UID"""
+        uid = pod.metadata.uid
+        spec = self._pod_affinity.get(uid)
+
+        if spec is None:
+            spec = self._build_affinity_spec(pod)
+            if uid is not None:
+                self._pod_affinity[uid] = spec
+
+        return spec
+
+    def _build_affinity_spec(self, pod) -> PodAffinitySpec:
+        """Walk a pod's affinity attribute chains once"""
+        pod_spec = pod.spec
+        affinity = pod_spec.affinity
+        has_spread_constraints = bool(pod_spec.topology_spread_constraints)
+
+        if not affinity:
+            return PodAffinitySpec(has_spread_constraints=has_spread_constraints)
+
+        pod_term_weights = []
+        for pod_affinity in (affinity.pod_affinity, affinity.pod_anti_affinity):
+            if pod_affinity:
+                pod_term_weights.extend(
+                    term.weight / 100.0
+                    for term in (pod_affinity.preferred_during_scheduling_ignored_during_execution or [])
+                )
+
+        node_affinity = affinity.node_affinity
+        node_terms = ()
+        if node_affinity:
+            node_terms = tuple(
+                (term.weight / 100.0, self._compile_selector_term(term.preference))
+                for term in (node_affinity.preferred_during_scheduling_ignored_during_execution or [])
+            )
+
+        return PodAffinitySpec(
+            pod_term_weights=tuple(pod_term_weights),
+            has_node_affinity=bool(node_affinity),
+            node_terms=node_terms,
+            has_spread_constraints=has_spread_constraints
+        )
 
-        Goals:
-        - Consolidate workloads to reduce active nodes
-        - Prefer nodes with better power efficiency
-        - Enable node scaling down when possible
-        """
+    @staticmethod
+    def _compile_selector_term(selector_term) -> _SelectorTerm:
+        """Freeze a selector term's expression values for O(1) membership tests"""
+        # Simplified implementation
+        if not hasattr(selector_term, 'match_expressions'):
+            return ()
 
-        node_metrics = state['nodes'].get(selected_node, {})
-
-        if not node_metrics:
-            return 0.5
-
-        # Prefer utilizing already-active nodes
-        current_usage = node_metrics['cpu_usage']
-
-        # Reward higher utilization (consolidation)
-        if current_usage > 0.1:  # Node is already active
-            consolidation_score = min(current_usage * 1.5, 1.0)
-        else:  # Activating new node
-            consolidation_score = 0.3
-
-        # Prefer nodes with higher pod count (consolidation)
-        pod_count_score = min(node_metrics['pod_count'] / 20.0, 1.0)
-
-        return (consolidation_score * 0.7 + pod_count_score * 0.3)
-
-    def _get_pod_cpu(self, pod) -> float:
-        """Extract CPU request from pod"""
-        total_cpu = 0.0
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                cpu = container.resources.requests.get('cpu', '0')
-                if cpu.endswith('m'):
-                    total_cpu += float(cpu[:-1]) / 1000
-                else:
-                    total_cpu += float(cpu)
-        return total_cpu
-
-    def _get_pod_memory(self, pod) -> float:
-        """Extract memory request from pod (in bytes)"""
-        total_mem = 0.0
-        for container in pod.spec.containers:
-            if container.resources and container.resources.requests:
-                mem = container.resources.requests.get('memory', '0')
-                if mem.endswith('Gi'):
-                    total_mem += float(mem[:-2]) * 1024**3
-                elif mem.endswith('Mi'):
-                    total_mem += float(mem[:-2]) * 1024**2
-                elif mem.endswith('Ki'):
-                    total_mem += float(mem[:-2]) * 1024
-        return total_mem
+        return tuple(
+            (expr.key, expr.operator, frozenset(expr.values or []))
+            for expr in (selector_term.match_expressions or [])
+        )
 
     def _check_node_selector_term(
         self,
-        selector_term,
+        expressions: _SelectorTerm,
         node_labels: Dict[str, str]
     ) -> bool:
-        """Check if node labels match selector term"""
-        # Simplified implementation
-        if not hasattr(selector_term, 'match_expressions'):
-            return True
-
-        for expr in (selector_term.match_expressions or []):
-            key = expr.key
-            operator = expr.operator
-            values = expr.values or []
-
+        """Check if node labels match a compiled selector term"""
+        for key, operator, values in expressions:
             node_value = node_labels.get(key)
 
             if operator == "In":
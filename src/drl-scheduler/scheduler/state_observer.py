@@ -17,18 +17,169 @@ Cluster State Observer for collecting metrics and state information
 """
 
 import asyncio
+import bisect
 import logging
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+import threading
+import time
+import types
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from array import array
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from kubernetes import client
+import numpy as np
+from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
 
 from .config import SchedulerConfig
+from .utils import parse_cpu, parse_memory, pod_requests
 
 logger = logging.getLogger(__name__)
 
+# Terminated pods hold no node resources, so the pod cache leaves them out
+_ACTIVE_POD_SELECTOR = 'status.phase!=Succeeded,status.phase!=Failed'
+
+# Full lists are large and the API server gzips large responses on
+# request; urllib3 decodes them transparently. Watch streams are read
+# undecoded by the client, so they are not asked to compress.
+_LIST_HEADERS = {'Accept-Encoding': 'gzip'}
+
+# Page size for full lists
+_LIST_PAGE_SIZE = 500
+
+
+class NodeTable:
+    """
+    Columnar snapshot of node metrics; row i describes names[i]
+
+    Built once per state update and never mutated afterwards, so state
+    snapshots can share it by reference.
+    """
+
+    __slots__ = (
+        'names', 'idx', 'cpu_used', 'cpu_alloc', 'mem_used', 'mem_alloc',
+        'cpu_usage', 'mem_usage', 'pod_count', 'ready', 'labels', 'taints',
+        'features', 'timestamp', '_rows', '_usage_stats'
+    )
+
+    def __init__(
+        self,
+        names: List[str] = (),
+        cpu_alloc: List[float] = (),
+        cpu_used: List[float] = (),
+        mem_alloc: List[float] = (),
+        mem_used: List[float] = (),
+        pod_count: List[int] = (),
+        ready: List[bool] = (),
+        labels: List[Dict[str, str]] = (),
+        taints: List[list] = (),
+        timestamp: Optional[datetime] = None
+    ):
+        self.names: List[str] = list(names)
+        self.idx: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        count = len(self.names)
+
+        self.cpu_alloc = np.asarray(cpu_alloc, dtype=float)
+        self.cpu_used = np.asarray(cpu_used, dtype=float)
+        self.mem_alloc = np.asarray(mem_alloc, dtype=float)
+        self.mem_used = np.asarray(mem_used, dtype=float)
+        self.cpu_usage = np.divide(
+            self.cpu_used, self.cpu_alloc,
+            out=np.zeros(count), where=self.cpu_alloc > 0
+        )
+        self.mem_usage = np.divide(
+            self.mem_used, self.mem_alloc,
+            out=np.zeros(count), where=self.mem_alloc > 0
+        )
+        self.pod_count = np.asarray(pod_count, dtype=float)
+        self.ready = np.asarray(ready, dtype=bool)
+        self.labels: List[Dict[str, str]] = list(labels)
+        self.taints: List[list] = list(taints)
+        self.timestamp = timestamp
+
+        # Per-node dicts for API consumers, built on first use
+        self._rows: Optional[Dict[str, Dict[str, Any]]] = None
+
+        # ((mean cpu, mean mem), (std cpu, std mem)) usage, built on first use
+        self._usage_stats: Optional[Tuple[Tuple[float, float], Tuple[float, float]]] = None
+
+        # Per-node policy features in DRLAgent._encode_state column order;
+        # pod counts are left unnormalized. Network and disk usage are
+        # placeholders until a metrics server is used.
+        placeholder = np.zeros(count)
+        self.features = np.column_stack([
+            self.cpu_usage,
+            self.mem_usage,
+            self.pod_count,
+            placeholder,  # network_rx
+            placeholder,  # network_tx
+            placeholder,  # disk_usage
+            self.cpu_alloc,
+            self.mem_alloc,
+            self.ready,
+            np.fromiter((len(t) for t in self.taints), float, count) / 10.0
+        ]).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node metric dicts keyed by node name"""
+        if self._rows is None:
+            self._rows = {
+                name: {
+                    'cpu_allocatable': cpu_alloc,
+                    'memory_allocatable': mem_alloc,
+                    'cpu_used': cpu_used,
+                    'memory_used': mem_used,
+                    'cpu_usage': cpu_usage,
+                    'memory_usage': mem_usage,
+                    'pod_count': int(pod_count),
+                    'is_ready': ready,
+                    'taints': taints,
+                    'labels': labels,
+                    'network_rx': 0.0,  # Placeholder - use metrics server
+                    'network_tx': 0.0,  # Placeholder
+                    'disk_usage': 0.0,  # Placeholder
+                    'timestamp': self.timestamp
+                }
+                for name, cpu_alloc, mem_alloc, cpu_used, mem_used, cpu_usage,
+                    mem_usage, pod_count, ready, taints, labels in zip(
+                        self.names,
+                        self.cpu_alloc.tolist(),
+                        self.mem_alloc.tolist(),
+                        self.cpu_used.tolist(),
+                        self.mem_used.tolist(),
+                        self.cpu_usage.tolist(),
+                        self.mem_usage.tolist(),
+                        self.pod_count.tolist(),
+                        self.ready.tolist(),
+                        self.taints,
+                        self.labels
+                    )
+            }
+        return self._rows
+
+    def usage_stats(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """((mean cpu, mean mem), (std cpu, std mem)) of node usage"""
+        if self._usage_stats is None:
+            if not len(self):
+                self._usage_stats = ((0.0, 0.0), (0.0, 0.0))
+                return self._usage_stats
+
+            # One pass over both columns: var = E[X^2] - E[X]^2, clamped
+            # since rounding can take it slightly below zero
+            usage = np.stack((self.cpu_usage, self.mem_usage), axis=1)
+            mean = usage.sum(axis=0) / len(self)
+            var = np.einsum('ij,ij->j', usage, usage) / len(self) - mean * mean
+            std = np.sqrt(np.maximum(var, 0.0))
+
+            self._usage_stats = (
+                (float(mean[0]), float(mean[1])), (float(std[0]), float(std[1]))
+            )
+        return self._usage_stats
+
 
 class ClusterStateObserver:
     """Observes and tracks cluster state for scheduling decisions"""
@@ -37,15 +188,35 @@ class ClusterStateObserver:
         self.v1 = v1_api
         self.config = config
 
-        # State cache
-        self.node_metrics = {}
+        # State cache; node metrics are kept column-wise in node_table
+        self.node_table = NodeTable()
         self.pod_metrics = {}
         self.cluster_state = {}
 
-        # Metrics collection
-        self.metrics_history = defaultdict(list)
+        # Metrics collection; each series is a (timestamps, values) pair of
+        # float arrays. One sample per update, so a window holds at most
+        # metrics_window / metrics_interval of them.
+        self._history_len = self.config.metrics_window // max(self.config.metrics_interval, 1) + 1
+        self.metrics_history = defaultdict(lambda: (array('d'), array('d')))
         self.last_update = None
 
+        # Watch-backed caches of the raw API objects; only mutated on the
+        # event loop, from events the watch threads hand over
+        self._nodes: Dict[str, Any] = {}
+        self._pods: Dict[str, Any] = {}
+        self._watches: List[watch.Watch] = []
+        self._watch_stop = threading.Event()
+
+        # Per-update collection is CPU-bound, so it runs on a private
+        # worker rather than the loop or the shared default executor; one
+        # worker keeps updates ordered
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-observer")
+
+        # Parsed static node fields keyed by node name, as
+        # (resourceVersion, cpu_allocatable, memory_allocatable, is_ready,
+        # taints, labels); only touched by the collection worker
+        self._node_fields: Dict[str, tuple] = {}
+
         # Background task
         self.update_task = None
 
@@ -53,6 +224,33 @@ class ClusterStateObserver:
         """Initialize the state observer"""
         logger.info("Initializing cluster state observer...")
 
+        # Mirror nodes and pods through watches instead of re-listing them
+        # on every update
+        loop = asyncio.get_running_loop()
+        synced = []
+        for kind, list_fn, cache, list_kwargs in (
+            ('node', self.v1.list_node, self._nodes, {}),
+            ('pod', self.v1.list_pod_for_all_namespaces, self._pods,
+             {'field_selector': _ACTIVE_POD_SELECTOR})
+        ):
+            event = asyncio.Event()
+            synced.append(asyncio.create_task(event.wait()))
+            threading.Thread(
+                target=self._watch_resource,
+                args=(list_fn, cache, event, loop),
+                kwargs=list_kwargs,
+                name=f"{kind}-watch",
+                daemon=True
+            ).start()
+
+        # Wait for the initial lists, but start with partial state rather
+        # than block if the API server is slow
+        _, pending = await asyncio.wait(synced, timeout=30)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Cluster state caches not synced yet, continuing")
+
         # Initial state collection
         await self.update_state()
 
@@ -73,146 +271,289 @@ class ClusterStateObserver:
     async def update_state(self):
         """Update the complete cluster state"""
         try:
-            # Collect node metrics
-            await self._collect_node_metrics()
-
-            # Collect pod metrics
-            await self._collect_pod_metrics()
-
-            # Calculate cluster-level metrics
-            await self._calculate_cluster_metrics()
-
-            self.last_update = datetime.now()
+            # Read from the watch caches; the pods feed both per-node usage
+            # and pod metrics
+            nodes = list(self._nodes.values())
+            pods = list(self._pods.values())
+
+            # One timestamp for everything collected in this update
+            now = datetime.now()
+
+            # Collect off the loop, then publish the results together so a
+            # snapshot never mixes two updates
+            loop = asyncio.get_running_loop()
+            node_table, pod_metrics, cluster_state = await loop.run_in_executor(
+                self._executor, self._collect_state, nodes, pods, now
+            )
+            self.node_table = node_table
+            self.pod_metrics = pod_metrics
+            if cluster_state is not None:
+                self.cluster_state = cluster_state
+
+            self.last_update = now
 
         except Exception as e:
             logger.error(f"Error updating state: {e}")
 
-    async def _collect_node_metrics(self):
-        """Collect metrics for all nodes"""
-        try:
-            nodes = self.v1.list_node()
-
-            for node in nodes.items:
-                node_name = node.metadata.name
-
-                # Get node status
-                status = node.status
+    def _watch_resource(self, list_fn, cache: Dict[str, Any], synced: asyncio.Event, loop, **list_kwargs):
+        """List a resource, then stream its changes into a cache"""
+        w = watch.Watch()
+        self._watches.append(w)
+        resource_version = None
 
-                # Extract allocatable resources
-                allocatable = status.allocatable or {}
-
-                # Get current capacity
-                capacity = status.capacity or {}
-
-                # Calculate usage (simplified - in production use Metrics API)
-                cpu_allocatable = self._parse_cpu(allocatable.get('cpu', '0'))
-                memory_allocatable = self._parse_memory(allocatable.get('memory', '0'))
-
-                # Get pods on this node
-                pods = self.v1.list_pod_for_all_namespaces(
-                    field_selector=f'spec.nodeName={node_name}'
+        while not self._watch_stop.is_set():
+            try:
+                if resource_version is None:
+                    items, resource_version = self._list_all(list_fn, **list_kwargs)
+                    loop.call_soon_threadsafe(self._replace_cache, cache, items, synced)
+
+                stream = w.stream(
+                    list_fn,
+                    resource_version=resource_version,
+                    timeout_seconds=60,
+                    **list_kwargs
                 )
 
-                # Calculate resource usage
-                cpu_used = 0.0
-                memory_used = 0.0
-
-                for pod in pods.items:
-                    for container in pod.spec.containers:
-                        if container.resources and container.resources.requests:
-                            requests = container.resources.requests
-                            cpu_used += self._parse_cpu(requests.get('cpu', '0'))
-                            memory_used += self._parse_memory(requests.get('memory', '0'))
-
-                # Node metrics
-                self.node_metrics[node_name] = {
-                    'cpu_allocatable': cpu_allocatable,
-                    'memory_allocatable': memory_allocatable,
-                    'cpu_used': cpu_used,
-                    'memory_used': memory_used,
-                    'cpu_usage': cpu_used / cpu_allocatable if cpu_allocatable > 0 else 0,
-                    'memory_usage': memory_used / memory_allocatable if memory_allocatable > 0 else 0,
-                    'pod_count': len(pods.items),
-                    'is_ready': self._is_node_ready(node),
-                    'taints': node.spec.taints or [],
-                    'labels': node.metadata.labels or {},
-                    'network_rx': 0.0,  # Placeholder - use metrics server
-                    'network_tx': 0.0,  # Placeholder
-                    'disk_usage': 0.0,  # Placeholder
-                    'timestamp': datetime.now()
-                }
-
-                # Store in history
-                self.metrics_history[f'node_{node_name}_cpu'].append({
-                    'timestamp': datetime.now(),
-                    'value': cpu_used / cpu_allocatable if cpu_allocatable > 0 else 0
-                })
+                for event in stream:
+                    obj = event['object']
+                    resource_version = obj.metadata.resource_version
+                    loop.call_soon_threadsafe(self._apply_event, cache, event['type'], obj)
+
+            except ApiException as e:
+                resource_version = None
+                if e.status == 410:  # Resource version expired
+                    logger.warning("Watch expired, relisting...")
+                else:
+                    logger.error(f"API exception in state watch: {e}")
+                    self._watch_stop.wait(5)
+            except Exception as e:
+                resource_version = None
+                logger.error(f"Error watching cluster state: {e}")
+                self._watch_stop.wait(5)
+
+    @staticmethod
+    def _list_all(list_fn, **list_kwargs):
+        """List every object of a resource page by page; returns (items, resourceVersion)"""
+        # resourceVersion=0 is served from the API server's watch cache
+        # rather than a quorum read from etcd. The cache may ignore the
+        # limit and return everything in one page, which ends the loop.
+        result = list_fn(
+            resource_version='0',
+            limit=_LIST_PAGE_SIZE,
+            _headers=_LIST_HEADERS,
+            **list_kwargs
+        )
+        items = list(result.items)
+        resource_version = result.metadata.resource_version
+
+        while result.metadata._continue:
+            result = list_fn(
+                limit=_LIST_PAGE_SIZE,
+                _continue=result.metadata._continue,
+                _headers=_LIST_HEADERS,
+                **list_kwargs
+            )
+            items.extend(result.items)
+
+        return items, resource_version
+
+    @staticmethod
+    def _object_key(obj) -> str:
+        """Cache key of an API object: namespace/name, or name if cluster-scoped"""
+        metadata = obj.metadata
+        if metadata.namespace:
+            return f"{metadata.namespace}/{metadata.name}"
+        return metadata.name
+
+    def _replace_cache(self, cache: Dict[str, Any], items: List[Any], synced: asyncio.Event):
+        """Reset a cache to the contents of a fresh list"""
+        cache.clear()
+        for obj in items:
+            cache[self._object_key(obj)] = obj
+        synced.set()
+
+    def _apply_event(self, cache: Dict[str, Any], event_type: str, obj):
+        """Apply one watch event to a cache"""
+        if event_type == 'DELETED':
+            cache.pop(self._object_key(obj), None)
+        else:
+            cache[self._object_key(obj)] = obj
+
+    def _collect_state(self, nodes, pods, now: datetime):
+        """Build (node_table, pod_metrics, cluster_state) from cached objects"""
+        # Parse each pod's container requests once; both collectors read
+        # them, aligned with pods
+        requests = [pod_requests(pod) for pod in pods]
+
+        # Collect node metrics
+        node_table = self._collect_node_metrics(nodes, pods, requests, now)
+
+        # Collect pod metrics
+        pod_metrics = self._collect_pod_metrics(pods, requests, now)
+
+        # Calculate cluster-level metrics
+        cluster_state = self._calculate_cluster_metrics(node_table, now)
+
+        return node_table, pod_metrics, cluster_state
+
+    def _collect_node_metrics(
+        self,
+        nodes,
+        pods,
+        pod_requests: List[Tuple[float, float]],
+        now: datetime
+    ) -> NodeTable:
+        """Collect metrics for all nodes into a new node table"""
+        # Rebuilt each update, so nodes removed from the cluster drop out
+        names = []
+        cpu_alloc = []
+        cpu_used_col = []
+        mem_alloc = []
+        mem_used_col = []
+        pod_count = []
+        ready = []
+        taints = []
+        labels = []
+
+        # History is stamped with the monotonic clock, so wall-clock
+        # adjustments cannot reorder it; samples older than the window
+        # are dropped
+        sampled_at = time.monotonic()
+        cutoff = sampled_at - self.config.metrics_window
+
+        # Bucket the cluster's pod requests by node once
+        requests_by_node = defaultdict(list)
+        for pod, requests in zip(pods, pod_requests):
+            node_name = pod.spec.node_name
+            if node_name:
+                requests_by_node[node_name].append(requests)
+
+        # Nodes change far less often than pods, so their static fields are
+        # only re-parsed when the watch delivered a new version
+        node_fields = {}
+
+        for node in nodes:
+            metadata = node.metadata
+            node_name = metadata.name
+
+            fields = self._node_fields.get(node_name)
+            if fields is None or fields[0] != metadata.resource_version:
+                fields = self._parse_node_fields(node)
+            node_fields[node_name] = fields
+            _, cpu_allocatable, memory_allocatable, is_ready, node_taints, node_labels = fields
+
+            # Get requests of the pods on this node
+            node_requests = requests_by_node.get(node_name, [])
+
+            # Calculate resource usage
+            cpu_used = sum(cpu for cpu, _ in node_requests)
+            memory_used = sum(memory for _, memory in node_requests)
+
+            # Node metrics
+            names.append(node_name)
+            cpu_alloc.append(cpu_allocatable)
+            cpu_used_col.append(cpu_used)
+            mem_alloc.append(memory_allocatable)
+            mem_used_col.append(memory_used)
+            pod_count.append(len(node_requests))
+            ready.append(is_ready)
+            taints.append(node_taints)
+            labels.append(node_labels)
+
+            # Store in history
+            timestamps, values = self.metrics_history[f'node_{node_name}_cpu']
+            timestamps.append(sampled_at)
+            values.append(cpu_used / cpu_allocatable if cpu_allocatable > 0 else 0.0)
+
+            # Trim history
+            self._trim_history(f'node_{node_name}_cpu', cutoff)
+
+        # Nodes that left the cluster drop out of the cache
+        self._node_fields = node_fields
+
+        return NodeTable(
+            names, cpu_alloc, cpu_used_col, mem_alloc, mem_used_col,
+            pod_count, ready, labels, taints, timestamp=now
+        )
+
+    def _parse_node_fields(self, node) -> tuple:
+        """Parse the fields of a node that do not depend on its pods"""
+        # Each model attribute access goes through a property, so resolve
+        # the top-level sections once
+        metadata = node.metadata
+        spec = node.spec
+        status = node.status
+
+        # Extract allocatable resources
+        allocatable = status.allocatable or {}
+
+        # Calculate usage (simplified - in production use Metrics API)
+        cpu_allocatable = parse_cpu(allocatable.get('cpu', '0'))
+        memory_allocatable = parse_memory(allocatable.get('memory', '0'))
+
+        return (
+            metadata.resource_version,
+            cpu_allocatable,
+            memory_allocatable,
+            self._is_node_ready(status),
+            spec.taints or [],
+            metadata.labels or {}
+        )
+
+    @property
+    def node_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-node metric dicts, derived from the node table"""
+        return self.node_table.rows()
+
+    def _collect_pod_metrics(
+        self,
+        pods,
+        pod_requests: List[Tuple[float, float]],
+        now: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """Collect metrics for all pods"""
+        pod_metrics = {}
 
-                # Trim history
-                self._trim_history(f'node_{node_name}_cpu')
+        for pod, (cpu_request, memory_request) in zip(pods, pod_requests):
+            metadata = pod.metadata
+            spec = pod.spec
+            status = pod.status
+            pod_key = f"{metadata.namespace}/{metadata.name}"
 
-        except ApiException as e:
-            logger.error(f"Error collecting node metrics: {e}")
+            pod_metrics[pod_key] = {
+                'cpu_request': cpu_request,
+                'memory_request': memory_request,
+                'phase': status.phase,
+                'node': spec.node_name,
+                'priority': getattr(spec, 'priority', 0),
+                'qos_class': status.qos_class,
+                'timestamp': now
+            }
 
-    async def _collect_pod_metrics(self):
-        """Collect metrics for all pods"""
-        try:
-            pods = self.v1.list_pod_for_all_namespaces()
-
-            for pod in pods.items:
-                pod_key = f"{pod.metadata.namespace}/{pod.metadata.name}"
-
-                # Pod resource requests
-                cpu_request = 0.0
-                memory_request = 0.0
-
-                for container in pod.spec.containers:
-                    if container.resources and container.resources.requests:
-                        requests = container.resources.requests
-                        cpu_request += self._parse_cpu(requests.get('cpu', '0'))
-                        memory_request += self._parse_memory(requests.get('memory', '0'))
-
-                self.pod_metrics[pod_key] = {
-                    'cpu_request': cpu_request,
-                    'memory_request': memory_request,
-                    'phase': pod.status.phase,
-                    'node': pod.spec.node_name,
-                    'priority': getattr(pod.spec, 'priority', 0),
-                    'qos_class': pod.status.qos_class,
-                    'timestamp': datetime.now()
-                }
+        return pod_metrics
 
-        except ApiException as e:
-            logger.error(f"Error collecting pod metrics: {e}")
+    def _calculate_cluster_metrics(self, table: NodeTable, now: datetime) -> Optional[Dict[str, Any]]:
+        """Calculate cluster-level aggregated metrics; None without nodes"""
 
-    async def _calculate_cluster_metrics(self):
-        """Calculate cluster-level aggregated metrics"""
+        total_nodes = len(table)
 
-        if not self.node_metrics:
-            return
+        if not total_nodes:
+            return None
 
-        # Aggregate node metrics
-        total_cpu = sum(n['cpu_allocatable'] for n in self.node_metrics.values())
-        total_memory = sum(n['memory_allocatable'] for n in self.node_metrics.values())
-        used_cpu = sum(n['cpu_used'] for n in self.node_metrics.values())
-        used_memory = sum(n['memory_used'] for n in self.node_metrics.values())
+        # Aggregate node metrics, one reduction per column
+        total_cpu = float(table.cpu_alloc.sum())
+        total_memory = float(table.mem_alloc.sum())
+        used_cpu = float(table.cpu_used.sum())
+        used_memory = float(table.mem_used.sum())
 
-        total_pods = sum(n['pod_count'] for n in self.node_metrics.values())
-        total_nodes = len(self.node_metrics)
-        ready_nodes = sum(1 for n in self.node_metrics.values() if n['is_ready'])
+        total_pods = int(table.pod_count.sum())
+        ready_nodes = int(table.ready.sum())
 
         # Calculate load balance variance
-        if total_nodes > 0:
-            avg_cpu = used_cpu / total_nodes
-            cpu_variance = sum(
-                (n['cpu_used'] - avg_cpu) ** 2
-                for n in self.node_metrics.values()
-            ) / total_nodes
-            load_balance_score = 1.0 / (1.0 + cpu_variance)
-        else:
-            load_balance_score = 0.0
+        cpu_variance = float(table.cpu_used.var())
+        load_balance_score = 1.0 / (1.0 + cpu_variance)
 
-        self.cluster_state = {
+        return {
             'total_cpu': total_cpu,
             'total_memory': total_memory,
             'used_cpu': used_cpu,
@@ -225,14 +566,17 @@ class ClusterStateObserver:
             'load_balance_score': load_balance_score,
             'avg_network_latency': 0.0,  # Placeholder
             'cluster_load': used_cpu / total_cpu if total_cpu > 0 else 0,
-            'timestamp': datetime.now()
+            'timestamp': now
         }
 
     async def get_state(self) -> Dict[str, Any]:
         """Get the current cluster state"""
+        # Both are rebuilt rather than mutated on update, so they stay
+        # consistent with the snapshot without copying
         return {
-            'nodes': self.node_metrics.copy(),
-            'pods': self.pod_metrics.copy(),
+            'pods': types.MappingProxyType(self.pod_metrics),
+            # node_table.rows() gives the per-node dicts
+            'node_table': self.node_table,
             **self.cluster_state
         }
 
@@ -245,57 +589,41 @@ class ClusterStateObserver:
         pod_key = f"{namespace}/{pod_name}"
         return self.pod_metrics.get(pod_key, {})
 
-    def _is_node_ready(self, node) -> bool:
-        """Check if node is ready"""
-        if not node.status or not node.status.conditions:
+    @staticmethod
+    def _is_node_ready(status) -> bool:
+        """Check if a node status reports Ready"""
+        if not status:
             return False
 
-        for condition in node.status.conditions:
-            if condition.type == "Ready" and condition.status == "True":
-                return True
-        return False
-
-    def _parse_cpu(self, cpu_str: str) -> float:
-        """Parse CPU string to float (in cores)"""
-        if not cpu_str:
-            return 0.0
-        if cpu_str.endswith('m'):
-            return float(cpu_str[:-1]) / 1000
-        return float(cpu_str)
-
-    def _parse_memory(self, mem_str: str) -> float:
-        """Parse memory string to float (in bytes)"""
-        if not mem_str:
-            return 0.0
-
-        units = {
-            'Ki': 1024,
-            'Mi': 1024**2,
-            'Gi': 1024**3,
-            'Ti': 1024**4,
-            'K': 1000,
-            'M': 1000**2,
-            'G': 1000**3,
-            'T': 1000**4
-        }
-
-        for unit, multiplier in units.items():
-            if mem_str.endswith(unit):
-                return float(mem_str[:-len(unit)]) * multiplier
-
-        return float(mem_str)
+        return any(
+            condition.type == "Ready" and condition.status == "True"
+            for condition in (status.conditions or ())
+        )
 
-    def _trim_history(self, key: str):
-        """Trim metrics history to configured window"""
-        cutoff = datetime.now() - timedelta(seconds=self.config.metrics_window)
+    def _trim_history(self, key: str, cutoff: float):
+        """Trim metrics history to samples newer than cutoff"""
+        history = self.metrics_history.get(key)
+        if history is None:
+            return
 
-        if key in self.metrics_history:
-            self.metrics_history[key] = [
-                m for m in self.metrics_history[key]
-                if m['timestamp'] > cutoff
-            ]
+        # Samples are appended in time order, so expired ones are a prefix;
+        # the length cap still holds if updates bunch up
+        timestamps, values = history
+        expired = max(
+            bisect.bisect_right(timestamps, cutoff),
+            len(timestamps) - self._history_len
+        )
+        if expired > 0:
+            del timestamps[:expired]
+            del values[:expired]
 
     async def shutdown(self):
         """Shutdown the observer"""
         if self.update_task:
             self.update_task.cancel()
+
+        self._watch_stop.set()
+        for w in self._watches:
+            w.stop()
+
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,83 @@
+"""
+Shared helpers for the DRL scheduler
+
+Kubernetes quantity parsing and the bounded per-pod caches used by the
+scheduler, the agent, the reward calculator and the state observer.
+"""
+
+import functools
+from typing import Tuple
+
+# Memory suffixes and their byte multipliers. Binary suffixes are
+# checked first so 'Mi' is not read as 'M'.
+_MEM_BINARY_SUFFIXES = ('Ki', 'Mi', 'Gi', 'Ti', 'Pi', 'Ei')
+_MEM_DECIMAL_SUFFIXES = ('k', 'K', 'M', 'G', 'T', 'P', 'E')
+_MEM_MULTIPLIERS = {
+    'Ki': 1024,
+    'Mi': 1024**2,
+    'Gi': 1024**3,
+    'Ti': 1024**4,
+    'Pi': 1024**5,
+    'Ei': 1024**6,
+    'k': 1000,
+    'K': 1000,
+    'M': 1000**2,
+    'G': 1000**3,
+    'T': 1000**4,
+    'P': 1000**5,
+    'E': 1000**6
+}
+
+# Entries kept by a BoundedCache unless told otherwise
+DEFAULT_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_cpu(cpu_str: str) -> float:
+    """Parse a CPU quantity to cores; raises ValueError if malformed"""
+    if not cpu_str:
+        return 0.0
+    if cpu_str.endswith('m'):
+        return float(cpu_str[:-1]) / 1000
+    return float(cpu_str)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_memory(mem_str: str) -> float:
+    """Parse a memory quantity to bytes; raises ValueError if malformed"""
+    if not mem_str:
+        return 0.0
+
+    if mem_str.endswith(_MEM_BINARY_SUFFIXES):
+        return float(mem_str[:-2]) * _MEM_MULTIPLIERS[mem_str[-2:]]
+    if mem_str.endswith(_MEM_DECIMAL_SUFFIXES):
+        return float(mem_str[:-1]) * _MEM_MULTIPLIERS[mem_str[-1]]
+
+    return float(mem_str)
+
+
+def pod_requests(pod) -> Tuple[float, float]:
+    """Total (cpu cores, memory bytes) requested by a pod's containers"""
+    requests = [
+        container.resources.requests
+        for container in pod.spec.containers
+        if container.resources and container.resources.requests
+    ]
+    return (
+        sum(parse_cpu(r.get('cpu', '0')) for r in requests),
+        sum(parse_memory(r.get('memory', '0')) for r in requests)
+    )
+
+
+class BoundedCache(dict):
+    """Dict that evicts its oldest entry once it holds maxsize entries"""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __setitem__(self, key, value):
+        if key not in self and len(self) >= self.maxsize:
+            # Evict the oldest entry
+            del self[next(iter(self))]
+        super().__setitem__(key, value)
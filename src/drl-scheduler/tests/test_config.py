@@ -0,0 +1,22 @@
+"""
+Tests for SchedulerConfig validation
+"""
+
+import dataclasses
+
+import pytest
+
+from scheduler.config import RewardWeights, get_config
+
+
+@pytest.mark.parametrize('changes', [
+    {'gamma': 0.0},
+    {'learning_rate': 0.0},
+    {'schedule_batch_max': 0},
+    {'cpu_inference_dtype': 'float16'},
+    {'ppo_epochs': 0},
+    {'reward_weights': RewardWeights(0.5, 0.5, 0.5, 0.0, 0.0)}
+])
+def test_invalid_config_raises(changes):
+    with pytest.raises(ValueError):
+        dataclasses.replace(get_config(), **changes)
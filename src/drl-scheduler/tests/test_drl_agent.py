@@ -0,0 +1,86 @@
+"""
+Tests for DRLAgent checkpoint loading and the replay buffer
+"""
+
+import asyncio
+import dataclasses
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from scheduler.config import get_config  # noqa: E402
+from scheduler.drl_agent import DRLAgent, ReplayBuffer  # noqa: E402
+from scheduler.models import SchedulerPolicyNetwork, SchedulerValueNetwork  # noqa: E402
+
+
+def _config(model_path):
+    return dataclasses.replace(
+        get_config(),
+        model_path=str(model_path),
+        model_name="legacy",
+        use_pretrained=True,
+        enable_compile=False,
+        cpu_inference_dtype="float32",
+        max_nodes=4,
+        feature_dim=16
+    )
+
+
+def test_load_legacy_policy_value_checkpoint(tmp_path):
+    config = _config(tmp_path)
+    state_dim = 10 * config.max_nodes + 8 + 6
+
+    # Checkpoint layout written before the policy and value networks were fused
+    policy = SchedulerPolicyNetwork(state_dim, config.max_nodes, config.feature_dim)
+    value = SchedulerValueNetwork(state_dim, config.feature_dim)
+    optimizer = torch.optim.Adam(list(policy.parameters()) + list(value.parameters()))
+    torch.save({
+        'policy_state_dict': policy.state_dict(),
+        'value_state_dict': value.state_dict(),
+        'optimizer_state_dict': optimizer.state_dict(),
+        'epsilon': 0.05,
+        'total_steps': 1234
+    }, tmp_path / "legacy.pt")
+
+    agent = DRLAgent(config, state_observer=None)
+    asyncio.run(agent.initialize())
+
+    assert agent.epsilon == 0.05
+    assert agent.total_steps == 1234
+
+    state = agent.model.state_dict()
+    for key, tensor in policy.state_dict().items():
+        assert torch.equal(state[key], tensor), key
+    for key, tensor in value.state_dict().items():
+        if key.startswith('value_head.'):
+            assert torch.equal(state[key], tensor), key
+
+
+def test_replay_buffer_wraps_around():
+    buffer = ReplayBuffer(capacity=3, state_dim=2)
+    for i in range(5):
+        buffer.add(np.full(2, i), i, float(i), np.full(2, i + 1), i == 4)
+
+    # The two oldest experiences were overwritten in place
+    assert len(buffer) == 3
+    assert buffer.pos == 2
+    assert sorted(buffer.actions.tolist()) == [2, 3, 4]
+    assert buffer.states[0].tolist() == [3.0, 3.0]
+
+
+def test_replay_buffer_samples_stored_experiences():
+    buffer = ReplayBuffer(capacity=8, state_dim=2)
+    for i in range(3):
+        buffer.add(np.full(2, i), i, float(i), np.full(2, i + 1), False)
+
+    states, actions, rewards, next_states, dones = buffer.sample(16)
+
+    assert states.shape == (16, 2)
+    assert set(actions.tolist()) <= {0, 1, 2}
+    # Columns stay aligned within each sampled row
+    np.testing.assert_array_equal(states[:, 0], actions)
+    np.testing.assert_array_equal(rewards, actions)
+    np.testing.assert_array_equal(next_states[:, 0], actions + 1)
+    assert not dones.any()
@@ -0,0 +1,124 @@
+"""
+Tests for batch placement accounting and toleration checks in DRLScheduler
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from scheduler.config import get_config
+from scheduler.k8s_scheduler import DRLScheduler
+from scheduler.state_observer import NodeTable
+
+
+def _pod(uid, cpu, memory='0', tolerations=None):
+    requests = {'cpu': cpu, 'memory': memory}
+    return SimpleNamespace(
+        metadata=SimpleNamespace(uid=uid, name=uid, namespace='default', labels={}),
+        spec=SimpleNamespace(
+            containers=[SimpleNamespace(resources=SimpleNamespace(requests=requests))],
+            tolerations=tolerations,
+            node_selector=None
+        )
+    )
+
+
+def _table():
+    return NodeTable(
+        names=['small', 'large'],
+        cpu_alloc=[1.0, 8.0],
+        cpu_used=[0.0, 0.0],
+        mem_alloc=[4 * 1024**3, 16 * 1024**3],
+        mem_used=[0.0, 0.0],
+        pod_count=[0, 0],
+        ready=[True, True],
+        labels=[{}, {}],
+        taints=[[], []]
+    )
+
+
+def test_overfilled_node_requeues_later_pod():
+    scheduler = DRLScheduler(get_config())
+    state = {'node_table': _table()}
+    first, second = _pod('first', '750m'), _pod('second', '750m')
+
+    async def run():
+        queue = asyncio.Queue()
+        placements = scheduler._commit_batch(
+            [first, second],
+            [['small', 'large'], ['small', 'large']],
+            ['small', 'small'],
+            state,
+            queue
+        )
+        requeued = await asyncio.wait_for(queue.get(), timeout=1.0)
+        return placements, requeued
+
+    placements, requeued = asyncio.run(run())
+
+    assert [(pod, node) for pod, _, node in placements] == [(first, 'small')]
+    assert requeued is second
+
+    # The charge outlives the batch, so the retry no longer sees room on
+    # the node the first pod filled
+    assert scheduler._get_eligible_nodes(second, state) == ['large']
+
+
+def test_requeue_gives_up_after_max_attempts(monkeypatch):
+    scheduler = DRLScheduler(get_config())
+    monkeypatch.setattr('scheduler.k8s_scheduler.MAX_REQUEUE_ATTEMPTS', 1)
+    monkeypatch.setattr('scheduler.k8s_scheduler.REQUEUE_BACKOFF', 0.0)
+    pod = _pod('pod', '750m')
+
+    async def run():
+        queue = asyncio.Queue()
+        scheduler._requeue(pod, 'small', queue)
+        await asyncio.wait_for(queue.get(), timeout=1.0)
+        scheduler._requeue(pod, 'small', queue)
+        await asyncio.sleep(0)
+        return queue.qsize()
+
+    assert asyncio.run(run()) == 0
+    assert scheduler.failed_schedules == 1
+
+
+def _taint(key, value, effect):
+    return SimpleNamespace(key=key, value=value, effect=effect)
+
+
+def _toleration(key, operator, value=None):
+    return SimpleNamespace(key=key, operator=operator, value=value)
+
+
+def test_check_tolerations_exists_and_equal():
+    scheduler = DRLScheduler(get_config())
+    taints = [_taint('dedicated', 'gpu', 'NoSchedule')]
+
+    exists = scheduler._index_tolerations(
+        _pod('exists', '0', tolerations=[_toleration('dedicated', 'Exists')])
+    )
+    equal = scheduler._index_tolerations(
+        _pod('equal', '0', tolerations=[_toleration('dedicated', 'Equal', 'gpu')])
+    )
+    mismatch = scheduler._index_tolerations(
+        _pod('mismatch', '0', tolerations=[_toleration('dedicated', 'Equal', 'cpu')])
+    )
+
+    assert scheduler._check_tolerations(exists, taints)
+    assert scheduler._check_tolerations(equal, taints)
+    assert not scheduler._check_tolerations(mismatch, taints)
+
+
+def test_check_tolerations_effects():
+    scheduler = DRLScheduler(get_config())
+    untolerated = scheduler._index_tolerations(_pod('none', '0'))
+
+    assert not scheduler._check_tolerations(
+        untolerated, [_taint('dedicated', 'gpu', 'NoSchedule')]
+    )
+    assert not scheduler._check_tolerations(
+        untolerated, [_taint('dedicated', 'gpu', 'NoExecute')]
+    )
+    assert scheduler._check_tolerations(
+        untolerated, [_taint('dedicated', 'gpu', 'PreferNoSchedule')]
+    )
+    assert scheduler._check_tolerations(untolerated, [])
@@ -0,0 +1,52 @@
+"""
+Tests for the scheduler network models
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from scheduler.models import (  # noqa: E402
+    AttentionSchedulerNetwork,
+    SchedulerPolicyNetwork,
+    SchedulerValueNetwork,
+    StateEncoder
+)
+
+
+def test_attention_forward_batch_matches_stacked_forward():
+    torch.manual_seed(0)
+    model = AttentionSchedulerNetwork(node_dim=10, pod_dim=6, hidden_dim=32).eval()
+    nodes = torch.randn(5, 10)
+    pods = torch.randn(3, 6)
+
+    with torch.no_grad():
+        batched = model.forward_batch(nodes, pods)
+        stacked = torch.cat([
+            model(nodes.unsqueeze(0), pods[i:i + 1]) for i in range(pods.shape[0])
+        ])
+
+    assert batched.shape == (3, 5)
+    torch.testing.assert_close(batched, stacked)
+
+
+def test_shared_encoder_is_kept_as_passed():
+    encoder = StateEncoder(8, 16)
+    policy = SchedulerPolicyNetwork(8, 4, 16, encoder=encoder)
+    value = SchedulerValueNetwork(8, 16, encoder=encoder)
+
+    assert policy.encoder is encoder and value.encoder is encoder
+
+    # An empty Sequential is falsy but still the caller's encoder
+    empty = torch.nn.Sequential()
+    assert SchedulerPolicyNetwork(8, 4, 16, encoder=empty).encoder is empty
+
+
+def test_shared_encoder_dtype_must_match():
+    encoder = StateEncoder(8, 16)
+
+    with pytest.raises(ValueError):
+        SchedulerValueNetwork(8, 16, dtype=torch.bfloat16, encoder=encoder)
+
+    # The failed construction left the shared encoder untouched
+    assert all(p.dtype == torch.float32 for p in encoder.parameters())
@@ -0,0 +1,44 @@
+"""
+Tests for RewardCalculator
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from scheduler.config import get_config
+from scheduler.reward_calculator import RewardCalculator
+from scheduler.state_observer import NodeTable
+
+
+def test_single_reward_matches_batch_scores():
+    table = NodeTable(
+        names=['idle', 'busy', 'empty'],
+        cpu_alloc=[4.0, 4.0, 0.0],
+        cpu_used=[0.0, 3.5, 0.0],
+        mem_alloc=[8 * 1024**3, 8 * 1024**3, 0.0],
+        mem_used=[0.0, 6 * 1024**3, 0.0],
+        pod_count=[0, 12, 0],
+        ready=[True, True, False],
+        labels=[{}, {}, {}],
+        taints=[[], [], []]
+    )
+    state = {'node_table': table}
+    pod = SimpleNamespace(
+        metadata=SimpleNamespace(uid='pod', name='pod', namespace='default'),
+        spec=SimpleNamespace(
+            containers=[SimpleNamespace(resources=SimpleNamespace(
+                requests={'cpu': '500m', 'memory': '1Gi'}
+            ))],
+            affinity=None,
+            topology_spread_constraints=None
+        )
+    )
+    calculator = RewardCalculator(get_config())
+
+    batch = calculator.calculate_rewards_batch(pod, table.names, state)
+
+    assert np.isfinite(batch).all()
+    for name, reward in zip(table.names, batch):
+        assert calculator.calculate_reward(pod, name, state) == pytest.approx(reward)
@@ -0,0 +1,43 @@
+"""
+Tests for the NodeTable snapshot
+"""
+
+import numpy as np
+import pytest
+
+from scheduler.state_observer import NodeTable
+
+
+def _table(cpu_used, mem_used):
+    count = len(cpu_used)
+    return NodeTable(
+        names=[f"node-{i}" for i in range(count)],
+        cpu_alloc=[4.0] * count,
+        cpu_used=cpu_used,
+        mem_alloc=[8.0] * count,
+        mem_used=mem_used,
+        pod_count=[0] * count,
+        ready=[True] * count,
+        labels=[{}] * count,
+        taints=[[]] * count
+    )
+
+
+def test_usage_stats_match_per_node_rows():
+    table = _table([0.5, 3.0, 1.25, 4.0], [1.0, 7.5, 2.0, 0.0])
+
+    # Previous computation over the per-node dicts
+    rows = table.rows().values()
+    cpu_usages = [row['cpu_usage'] for row in rows]
+    memory_usages = [row['memory_usage'] for row in rows]
+
+    (avg_cpu, avg_memory), (cpu_std, memory_std) = table.usage_stats()
+
+    assert avg_cpu == pytest.approx(np.mean(cpu_usages))
+    assert avg_memory == pytest.approx(np.mean(memory_usages))
+    assert cpu_std == pytest.approx(np.std(cpu_usages))
+    assert memory_std == pytest.approx(np.std(memory_usages))
+
+
+def test_usage_stats_of_empty_table():
+    assert NodeTable().usage_stats() == ((0.0, 0.0), (0.0, 0.0))
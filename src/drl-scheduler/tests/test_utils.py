@@ -0,0 +1,64 @@
+"""
+Tests for the shared quantity parsers and BoundedCache
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from scheduler.utils import BoundedCache, parse_cpu, parse_memory, pod_requests
+
+
+def _container(requests=None):
+    resources = SimpleNamespace(requests=requests) if requests is not None else None
+    return SimpleNamespace(resources=resources)
+
+
+def _pod(*containers):
+    return SimpleNamespace(spec=SimpleNamespace(containers=list(containers)))
+
+
+def test_parse_cpu():
+    assert parse_cpu('500m') == 0.5
+    assert parse_cpu('2') == 2.0
+    assert parse_cpu('') == 0.0
+
+
+def test_parse_memory_binary_and_decimal_suffixes():
+    assert parse_memory('1Gi') == 1024**3
+    assert parse_memory('1G') == 1000**3
+    assert parse_memory('128974848') == 128974848.0
+    assert parse_memory('') == 0.0
+
+
+@pytest.mark.parametrize('parse, quantity', [
+    (parse_cpu, 'lots'),
+    (parse_memory, '1Xi'),
+    (parse_memory, 'Gi')
+])
+def test_malformed_quantity_raises(parse, quantity):
+    with pytest.raises(ValueError):
+        parse(quantity)
+
+
+def test_pod_requests_skips_containers_without_requests():
+    pod = _pod(
+        _container({'cpu': '250m', 'memory': '64Mi'}),
+        _container(),
+        _container({}),
+        _container({'cpu': '1'})
+    )
+    assert pod_requests(pod) == (1.25, 64 * 1024**2)
+
+
+def test_bounded_cache_evicts_oldest():
+    cache = BoundedCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+
+    # Overwriting keeps the size and the insertion order
+    cache['a'] = 3
+    assert list(cache) == ['a', 'b']
+
+    cache['c'] = 4
+    assert cache == {'b': 2, 'c': 4}